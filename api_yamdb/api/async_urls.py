@@ -0,0 +1,9 @@
+from django.urls import include, path
+
+from .async_views import async_read_urls
+from .urls import v1_router, v1_urlpatterns
+
+urlpatterns = [
+    path("v1/", include(async_read_urls(v1_router.urls))),
+    *v1_urlpatterns,
+]
@@ -0,0 +1,107 @@
+"""
+Асинхронный путь чтения под ASGI.
+
+Django 3.2 выполняет синхронные представления под ASGI через
+sync_to_async(thread_sensitive=True), то есть все запросы процесса
+стоят в очереди к одному потоку. AsyncReadMiddleware переключает
+ASGI-запросы на URLconf settings.ASYNC_URLCONF, где list и retrieve
+произведений, отзывов и комментариев - корутины: GET и HEAD
+выполняются целиком (аутентификация, права, ORM, рендеринг ответа)
+в отдельном пуле из ASYNC_READ_THREADS потоков и не ждут друг друга,
+а цикл событий тем временем принимает новые запросы. Изменяющие
+запросы идут прежним путём. Под WSGI ничего не меняется.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.urls import URLPattern
+
+from .views import CommentViewSet, ReviewViewSet, TitleViewSet
+
+
+ASYNC_READ_VIEWSETS = (TitleViewSet, ReviewViewSet, CommentViewSet)
+READ_METHODS = ("GET", "HEAD")
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_READ_THREADS,
+            thread_name_prefix="read",
+        )
+    return _executor
+
+
+def call_view(view, request, *args, **kwargs):
+    """
+    Выполняет представление в потоке пула. Соединения потоков пула
+    закрываются по CONN_MAX_AGE, как обработчик WSGI делает это по
+    сигналам request_started и request_finished.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, "render") and callable(response.render):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read_view(view):
+    read = sync_to_async(
+        call_view, thread_sensitive=False, executor=get_executor()
+    )
+    write = sync_to_async(view)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await read(view, request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    return async_view
+
+
+def async_read_urls(urls):
+    """
+    Копия urls роутера DRF, в которой представления
+    ASYNC_READ_VIEWSETS заменены на async_read_view.
+    """
+    return [
+        URLPattern(
+            url.pattern, async_read_view(url.callback),
+            url.default_args, url.name,
+        )
+        if getattr(url.callback, "cls", None) in ASYNC_READ_VIEWSETS
+        else url
+        for url in urls
+    ]
+
+
+class AsyncReadMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Как в MiddlewareMixin: под ASGI middleware - корутина.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if settings.ASYNC_READ_VIEWS:
+            request.urlconf = settings.ASYNC_URLCONF
+        return await self.get_response(request)
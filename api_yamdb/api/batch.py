@@ -0,0 +1,99 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from reviews.models import Review, Title
+from .serializers import ReviewBatchItemSerializer
+from .signals import invalidate_title
+
+
+DUPLICATE_ERROR = "Вы уже оставили отзыв"
+TITLE_NOT_FOUND_ERROR = "Произведение не найдено"
+
+
+def item_error(index, errors):
+    return {"index": index, "errors": errors}
+
+
+def create_reviews(author, items):
+    """
+    Создаёт отзывы author из списка {title_id, text, score}.
+
+    Каждый элемент валидируется отдельно, существование произведений
+    и уже оставленные отзывы проверяются двумя запросами на весь пакет.
+    Корректные отзывы вставляются одним bulk_create, а рейтинг каждого
+    затронутого произведения сдвигается одним UPDATE. Возвращает
+    результаты в порядке элементов: {"index", "id", "title_id"} для
+    созданного отзыва или {"index", "errors"} для отклонённого.
+    """
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        serializer = ReviewBatchItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = item_error(index, serializer.errors)
+
+    title_ids = {data["title_id"] for _, data in valid}
+    titles = set(
+        Title.objects.filter(pk__in=title_ids).values_list("pk", flat=True)
+    )
+    reviewed = set(
+        Review.objects.filter(author=author, title_id__in=titles)
+        .values_list("title_id", flat=True)
+    )
+    reviews = []
+    for index, data in valid:
+        title_id = data["title_id"]
+        if title_id not in titles:
+            results[index] = item_error(
+                index, {"title_id": [TITLE_NOT_FOUND_ERROR]}
+            )
+        elif title_id in reviewed:
+            results[index] = item_error(
+                index, {api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_ERROR]}
+            )
+        else:
+            reviewed.add(title_id)
+            reviews.append((index, Review(author=author, **data)))
+    if not reviews:
+        return results
+
+    insert_reviews(author, [review for _, review in reviews])
+    for index, review in reviews:
+        results[index] = {
+            "index": index, "id": review.pk, "title_id": review.title_id
+        }
+    return results
+
+
+def insert_reviews(author, reviews):
+    deltas = defaultdict(lambda: [0, 0])
+    for review in reviews:
+        deltas[review.title_id][0] += review.score
+        deltas[review.title_id][1] += 1
+    try:
+        with transaction.atomic():
+            Review.objects.bulk_create(reviews)
+            for title_id, (score_delta, count_delta) in deltas.items():
+                Title.change_rating(title_id, score_delta, count_delta)
+    except IntegrityError:
+        # Отзыв на одно из произведений успел создать параллельный
+        # запрос; транзакция откатывается целиком.
+        raise serializers.ValidationError(
+            {api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_ERROR]}
+        )
+    if reviews[0].pk is None:
+        # bulk_create возвращает id не на всех СУБД; пара
+        # (author, title) уникальна, поэтому id находятся по ней.
+        ids = dict(
+            Review.objects.filter(author=author, title_id__in=deltas)
+            .values_list("title_id", "pk")
+        )
+        for review in reviews:
+            review.pk = ids[review.title_id]
+    for title_id in deltas:
+        invalidate_title(title_id)
@@ -0,0 +1,149 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from api_yamdb.replicas import use_primary
+
+
+def version_key(namespace, model, pk=None):
+    key = f"{namespace}-version:{model._meta.label_lower}"
+    if pk is not None:
+        key = f"{key}:{pk}"
+    return key
+
+
+def bump_version(namespace, model, pk=None):
+    """
+    Увеличивает версию модели (или отдельного объекта). Версии входят
+    в ключи кеша, поэтому все записи со старой версией перестают
+    находиться и вытесняются по TTL.
+    """
+    incr_counter(version_key(namespace, model, pk))
+
+
+def get_versions(keys):
+    versions = cache.get_many(keys)
+    return [(key, versions.get(key, 0)) for key in keys]
+
+
+def make_digest(*parts):
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def make_key(prefix, *parts):
+    return f"{prefix}:{make_digest(*parts)}"
+
+
+def incr_counter(key):
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+RESPONSE_NAMESPACE = "response"
+# Заголовки ответа, которые сохраняются в кеше вместе с данными.
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def response_stats(names):
+    """Счётчики попаданий и промахов кеша ответов по именам view."""
+    keys = [
+        f"response-cache-{kind}:{name}"
+        for name in names for kind in ("hits", "misses")
+    ]
+    values = cache.get_many(keys)
+    return {
+        name: {
+            kind: values.get(f"response-cache-{kind}:{name}", 0)
+            for kind in ("hits", "misses")
+        }
+        for name in names
+    }
+
+
+class CachedResponseMixin:
+    """
+    Базовый класс для CachedListMixin и CachedRetrieveMixin.
+    Кеширует данные ответов list/retrieve для анонимных GET-запросов.
+    Ключ строится из пути с query string и версий моделей, от которых
+    зависит ответ: response_cache_models для списков, а для объекта -
+    версия самого объекта и response_cache_detail_models. Версии
+    увеличиваются сигналами из api.signals при записи в эти модели.
+    При промахе ответ строится по основной базе, а не по реплике.
+    """
+    response_cache_name = None
+    response_cache_models = ()
+    response_cache_detail_models = ()
+    response_cache_timeout = settings.RESPONSE_CACHE_TIMEOUT
+
+    def get_response_cache_key(self, request):
+        lookup = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if lookup is None:
+            keys = [
+                version_key(RESPONSE_NAMESPACE, model)
+                for model in self.response_cache_models
+            ]
+        else:
+            model = self.get_queryset().model
+            keys = [version_key(RESPONSE_NAMESPACE, model, lookup)] + [
+                version_key(RESPONSE_NAMESPACE, related)
+                for related in self.response_cache_detail_models
+            ]
+        return make_key(
+            f"response-cache:{self.response_cache_name}",
+            request.get_full_path(),
+            get_versions(keys),
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            incr_counter(f"response-cache-hits:{self.response_cache_name}")
+            data, headers = cached
+            response = get_conditional_response(
+                request._request,
+                etag=headers.get("ETag"),
+                last_modified=parse_http_date_safe(
+                    headers.get("Last-Modified", "")
+                ),
+            ) or Response(data)
+            for header, value in headers.items():
+                response[header] = value
+            response["X-Cache"] = "HIT"
+            return response
+        incr_counter(f"response-cache-misses:{self.response_cache_name}")
+        # Ответ ляжет в кеш под текущими версиями, а отстающая реплика
+        # могла ещё не получить запись, которая их увеличила.
+        with use_primary():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {
+                header: response[header]
+                for header in VALIDATOR_HEADERS if header in response
+            }
+            cache.set(
+                key, (response.data, headers), self.response_cache_timeout
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,123 @@
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .cache import make_digest
+
+
+CONDITIONAL_HEADERS = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+
+
+class ConditionalGetMixin:
+    """
+    Базовый класс для ConditionalListMixin и ConditionalRetrieveMixin.
+
+    ETag строится по полям validator_fields объектов ответа (и по числу
+    объектов для постраничного списка), поэтому совпадает тогда и только
+    тогда, когда эти поля не менялись. Для списка ETag считается по
+    загруженной странице: при совпадении 304 отдаётся без сериализации,
+    иначе та же страница сериализуется, без повторных COUNT и выборки.
+    Для объекта при If-None-Match или If-Modified-Since валидатор
+    считается лёгким запросом values() без сериализатора и связанных
+    объектов.
+    """
+    validator_fields = ("updated_at",)
+
+    def has_conditional_headers(self, request):
+        return any(header in request.META for header in CONDITIONAL_HEADERS)
+
+    def get_validator_row(self, obj):
+        row = [obj.pk]
+        for field in self.validator_fields:
+            value = obj
+            for attr in field.split("__"):
+                value = getattr(value, attr)
+            row.append(value)
+        return row
+
+    def get_validator_values(self, queryset):
+        return [
+            [values.pop("pk")] + [values[field] for field in
+                                  self.validator_fields]
+            for values in queryset
+        ]
+
+    def get_page_count(self):
+        page = getattr(self.paginator, "page", None)
+        return page.paginator.count if page is not None else None
+
+    def make_etag(self, request, rows):
+        return quote_etag(make_digest(
+            request.get_full_path(), self.get_page_count(), rows
+        ))
+
+    def not_modified(self, request, etag, last_modified=None):
+        timestamp = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=timestamp
+        )
+        if response is not None:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag, last_modified=None):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        objects = page if page is not None else list(queryset)
+        etag = self.make_etag(
+            request, [self.get_validator_row(obj) for obj in objects]
+        )
+        if self.has_conditional_headers(request):
+            response = self.not_modified(request, etag)
+            if response is not None:
+                return response
+
+        serializer = self.get_serializer(objects, many=True)
+        if page is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(serializer.data)
+        return self.set_validators(response, etag)
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Для объекта дополнительно отдаётся Last-Modified по updated_at."""
+    last_modified_field = "updated_at"
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.has_conditional_headers(request):
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            values = (
+                self.get_queryset()
+                .prefetch_related(None)
+                .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values("pk", *self.validator_fields)
+                .first()
+            )
+            if values is not None:
+                last_modified = values[self.last_modified_field]
+                response = self.not_modified(
+                    request,
+                    self.make_etag(
+                        request, self.get_validator_values([values])
+                    ),
+                    last_modified,
+                )
+                if response is not None:
+                    return response
+
+        instance = self.get_object()
+        response = Response(self.get_serializer(instance).data)
+        return self.set_validators(
+            response,
+            self.make_etag(request, [self.get_validator_row(instance)]),
+            getattr(instance, self.last_modified_field),
+        )
@@ -1,13 +1,61 @@
-from django_filters import CharFilter, FilterSet
+from django.db.models import Count
+from django_filters import (
+    BaseInFilter, CharFilter, ChoiceFilter, FilterSet,
+)
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import search_titles
+
+
+class SlugInFilter(BaseInFilter, CharFilter):
+    """Список слагов через запятую: ?genre=drama,comedy."""
 
 
 class TitleFilterBackend(FilterSet):
-    genre = CharFilter(field_name="genre__slug", lookup_expr="icontains")
-    category = CharFilter(field_name="category__slug", lookup_expr="icontains")
+    """
+    Слаги сравниваются целиком и находятся по уникальным индексам.
+    Жанры фильтруются полусоединением title_id IN (...) по таблице связи,
+    поэтому произведение не дублируется, если совпало несколько жанров,
+    и DISTINCT не нужен. genre_mode=any (по умолчанию) - хотя бы один
+    из жанров, genre_mode=all - все перечисленные.
+    """
+    GENRE_MODES = (("any", "any"), ("all", "all"))
+
+    genre = SlugInFilter(method="filter_genre")
+    genre_mode = ChoiceFilter(choices=GENRE_MODES, method="skip")
+    category = SlugInFilter(field_name="category__slug")
     name = CharFilter(field_name="name", lookup_expr="contains")
 
     class Meta:
         model = Title
         fields = ("genre", "category", "name", "year")
+
+    def skip(self, queryset, name, value):
+        return queryset
+
+    def filter_genre(self, queryset, name, value):
+        slugs = set(value)
+        if not slugs:
+            return queryset
+        links = Title.genre.through.objects.filter(genre__slug__in=slugs)
+        if self.form.cleaned_data.get("genre_mode") == "all":
+            # Пара (title, genre) в таблице связи уникальна.
+            links = links.values("title_id").annotate(
+                genres=Count("genre_id")
+            ).filter(genres=len(slugs))
+        return queryset.filter(pk__in=links.values("title_id"))
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск ?search= по названию и описанию произведения
+    с сортировкой по релевантности (см. reviews.search).
+    """
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return search_titles(queryset, query)
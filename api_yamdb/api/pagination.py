@@ -0,0 +1,236 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    CursorPagination, PageNumberPagination, _reverse_ordering,
+)
+
+from api_yamdb.replicas import use_primary
+from .cache import get_versions, make_key, version_key
+
+
+COUNT_NAMESPACE = "pagination-count"
+
+
+def estimate_count(queryset):
+    """
+    Оценка числа строк таблицы по статистике планировщика.
+    Доступна только для PostgreSQL, для остальных СУБД - None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            (queryset.model._meta.db_table,),
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class CachedCountPaginator(Paginator):
+    def __init__(self, object_list, per_page, count_getter, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_getter = count_getter
+
+    @cached_property
+    def count(self):
+        return self.count_getter()
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Постраничная пагинация, которая не считает COUNT(*) на каждый запрос:
+    число объектов кешируется по (эндпоинт, параметры фильтрации) на
+    PAGINATION_COUNT_CACHE_TIMEOUT секунд и сбрасывается при записи в
+    модели из view.count_cache_models. Для списков без фильтров можно
+    вернуть оценку по статистике таблицы, если она больше
+    PAGINATION_ESTIMATE_COUNT_OVER.
+    """
+    count_cache_timeout = settings.PAGINATION_COUNT_CACHE_TIMEOUT
+    estimate_count_over = settings.PAGINATION_ESTIMATE_COUNT_OVER
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        self.request = request
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, queryset, page_size):
+        return CachedCountPaginator(
+            queryset, page_size, lambda: self.get_count(queryset)
+        )
+
+    def get_filter_params(self):
+        return sorted(
+            (key, value)
+            for key, values in self.request.query_params.lists()
+            if key not in (self.page_query_param, self.page_size_query_param)
+            for value in values
+        )
+
+    def get_count_cache_key(self, queryset, params):
+        models = getattr(
+            self.view, "count_cache_models", (queryset.model,)
+        )
+        keys = [version_key(COUNT_NAMESPACE, model) for model in models]
+        return make_key(
+            f"pagination-count:{self.request.path}",
+            get_versions(keys),
+            params,
+        )
+
+    def get_count(self, queryset):
+        params = self.get_filter_params()
+        if not params and self.estimate_count_over is not None:
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate > self.estimate_count_over:
+                return estimate
+        key = self.get_count_cache_key(queryset, params)
+        count = cache.get(key)
+        if count is None:
+            # Как и ответы в api.cache: число ложится в кеш под текущими
+            # версиями, поэтому считается по основной базе.
+            with use_primary():
+                count = queryset.count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по составному ключу из всех полей ordering.
+
+    CursorPagination DRF фильтрует только по первому полю, а строки
+    с одинаковым значением пропускает смещением (OFFSET). Здесь позиция
+    курсора - значения всех полей ordering, и страница выбирается
+    условием (a < x) OR (a = x AND b < y): ключ уникален, смещение
+    всегда 0, и ленты с массой одинаковых дат не сканируются.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Повторяет CursorPagination.paginate_queryset, кроме условия
+        # на позицию курсора.
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self.keyset_filter(
+                queryset.model, current_position, reverse
+            ))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        if reverse:
+            self.page = list(reversed(self.page))
+        self.set_positions(
+            reverse, current_position is not None or offset > 0,
+            current_position, following_position,
+        )
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def set_positions(self, reverse, has_current, current_position,
+                      following_position):
+        """Ссылки вперёд и назад, как в CursorPagination."""
+        has_following = following_position is not None
+        if reverse:
+            self.has_next, self.has_previous = has_current, has_following
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next, self.has_previous = has_following, has_current
+            self.next_position = following_position
+            self.previous_position = current_position
+
+    def keyset_filter(self, model, position, reverse):
+        try:
+            values = json.loads(position)
+            if len(values) != len(self.ordering):
+                raise ValueError
+            values = [
+                model._meta.get_field(order.lstrip("-")).to_python(value)
+                for order, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        equal = {}
+        for order, value in zip(self.ordering, values):
+            attr = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") != reverse else "gt"
+            condition |= Q(**equal, **{f"{attr}__{lookup}": value})
+            equal[attr] = value
+        return condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        return json.dumps([
+            str(getattr(instance, order.lstrip("-"))) for order in ordering
+        ])
+
+
+class PubDateCursorPagination(KeysetCursorPagination):
+    """
+    Курсорная пагинация по ключу (pub_date, id) в порядке Meta.ordering
+    отзывов и комментариев: страница выбирается условием по индексу,
+    без COUNT(*) и OFFSET-сканирования.
+    """
+    ordering = ("-pub_date", "-id")
+
+
+class FeedPagination(PageNumberPagination):
+    """
+    По умолчанию - обычная постраничная пагинация. Если в запросе есть
+    параметр ?cursor= (в том числе пустой, для первой страницы),
+    лента отдаётся курсорной пагинацией.
+    """
+    cursor_pagination_class = PubDateCursorPagination
+
+    def get_cursor_paginator(self, request):
+        paginator = self.cursor_pagination_class()
+        if paginator.cursor_query_param in request.query_params:
+            return paginator
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = self.get_cursor_paginator(request)
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
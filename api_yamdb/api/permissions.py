@@ -1,4 +1,31 @@
 from rest_framework import permissions
+from rest_framework_simplejwt.settings import api_settings
+
+from users.tokens import ROLE_CLAIM, SUPERUSER_CLAIM
+
+
+def get_roles(request):
+    """
+    Роль и признак суперпользователя из проверенного токена, а для
+    токенов без этих claims - из пользователя. Токен с устаревшей ролью
+    не проходит аутентификацию (см. CachedJWTAuthentication).
+    """
+    token = request.auth
+    if token is not None and ROLE_CLAIM in token:
+        return token[ROLE_CLAIM], token.get(SUPERUSER_CLAIM, False)
+    return request.user.role, request.user.is_superuser
+
+
+def get_user_id(request):
+    token = request.auth
+    if token is not None and api_settings.USER_ID_CLAIM in token:
+        return token[api_settings.USER_ID_CLAIM]
+    return request.user.pk
+
+
+def is_admin(request):
+    role, is_superuser = get_roles(request)
+    return role == "admin" or is_superuser
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -8,8 +35,7 @@ class IsAdminOrReadOnly(permissions.BasePermission):
     """
     def has_permission(self, request, view):
         return request.method in permissions.SAFE_METHODS or (
-            request.user.is_authenticated
-            and (request.user.is_superuser or request.user.is_admin)
+            request.user.is_authenticated and is_admin(request)
         )
 
 
@@ -24,11 +50,12 @@ class IsOwnerOrModeratorOrAdmin(permissions.BasePermission):
         )
 
     def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        role, _ = get_roles(request)
         return (
-            request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
-            or request.user.is_admin
-            or request.user.is_moderator
+            obj.author_id == get_user_id(request)
+            or role in ("admin", "moderator")
         )
 
 
@@ -37,15 +64,7 @@ class IsAdminOrSuperuser(permissions.BasePermission):
     Админ и суперюзер имеют доступ к ресурсам.
     """
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and (
-                request.user.is_admin
-                or request.user.is_superuser)
-        )
+        return request.user.is_authenticated and is_admin(request)
 
     def has_object_permission(self, request, view, obj):
-        return (
-            obj == request.user
-            or request.user.is_admin
-            or request.user.is_superuser)
+        return obj.pk == get_user_id(request) or is_admin(request)
@@ -0,0 +1,44 @@
+"""
+JSON-рендерер на orjson, если пакет установлен, иначе - stdlib json
+через стандартный JSONRenderer DRF.
+
+orjson сам сериализует dict/list (в том числе OrderedDict и ReturnList
+сериализаторов), datetime, date и UUID; остальное (Decimal, ленивые
+строки, timedelta) передаётся в encoders.JSONEncoder DRF, поэтому
+ответ совпадает с JSONRenderer. Отступы (`; indent=4` и Browsable API)
+и настройки UNICODE_JSON/COMPACT_JSON=False рендерит JSONRenderer.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+ORJSON_OPTIONS = (
+    orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else None
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=ORJSON_OPTIONS
+        )
+        # Как JSONRenderer: U+2028 и U+2029 экранируются, чтобы ответ
+        # оставался подмножеством JavaScript.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from reviews.models import Category, Comment, Genre, Review, Title
 
@@ -57,20 +59,35 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True
     )
 
-    def validate(self, data):
-        request = self.context.get("request")
-        author = request.user
-        title_id = self.context.get("view").kwargs.get("title_id")
-        if (request.method == "POST" and Review.objects.filter(
-            author=author,
-            title_id=title_id
-        ).exists()):
-            raise serializers.ValidationError("Вы уже оставили отзыв")
-        return data
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique_author_title:
+        # без предварительного exists() и без гонки между проверкой
+        # и вставкой при одновременных запросах.
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=validated_data["author"],
+                title=validated_data["title"],
+            ).exists():
+                raise
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: ["Вы уже оставили отзыв"]}
+            )
 
     class Meta:
         model = Review
-        fields = ("__all__")
+        # updated_at нужен только валидаторам условных GET-запросов.
+        exclude = ("updated_at",)
+
+
+class ReviewBatchItemSerializer(serializers.ModelSerializer):
+    """Элемент пакетной загрузки отзывов, см. api.batch."""
+    title_id = serializers.IntegerField()
+
+    class Meta:
+        model = Review
+        fields = ("title_id", "text", "score")
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -85,4 +102,4 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = ("__all__")
+        exclude = ("updated_at",)
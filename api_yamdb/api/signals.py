@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title
+from reviews.signals import data_imported
+from .cache import RESPONSE_NAMESPACE, bump_version
+from .facets import FACET_MODELS, FACET_NAMESPACE
+from .pagination import COUNT_NAMESPACE
+
+
+User = get_user_model()
+
+COUNTED_MODELS = (Category, Genre, Title, User)
+
+
+def bump_on_commit(namespace, model, pk=None):
+    """
+    Версия увеличивается после фиксации транзакции: иначе параллельный
+    запрос успел бы закешировать старые данные под новой версией.
+    """
+    transaction.on_commit(lambda: bump_version(namespace, model, pk))
+
+
+def invalidate_title(title_id):
+    """Сбрасывает кеш списков произведений и одного произведения."""
+    bump_on_commit(RESPONSE_NAMESPACE, Title)
+    if title_id is not None:
+        bump_on_commit(RESPONSE_NAMESPACE, Title, title_id)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_counts(sender, **kwargs):
+    if sender in COUNTED_MODELS:
+        bump_on_commit(COUNT_NAMESPACE, sender)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_facet_index(sender, **kwargs):
+    if sender in FACET_MODELS:
+        bump_on_commit(FACET_NAMESPACE, sender)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_dictionary_responses(sender, **kwargs):
+    bump_on_commit(RESPONSE_NAMESPACE, sender)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title_responses(sender, instance, **kwargs):
+    invalidate_title(instance.pk)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_title_responses_by_review(sender, instance, **kwargs):
+    # Отзывы меняют рейтинг произведения.
+    invalidate_title(instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if not action.startswith("post_"):
+        return
+    bump_on_commit(COUNT_NAMESPACE, Title)
+    bump_on_commit(FACET_NAMESPACE, Title)
+    if not reverse:
+        invalidate_title(instance.pk)
+        return
+    bump_on_commit(RESPONSE_NAMESPACE, Title)
+    if pk_set is None:
+        # clear() со стороны жанра: затронутые произведения неизвестны,
+        # версия жанров входит в ключи всех карточек произведений.
+        bump_on_commit(RESPONSE_NAMESPACE, Genre)
+        return
+    for title_id in pk_set:
+        bump_on_commit(RESPONSE_NAMESPACE, Title, title_id)
+
+
+@receiver(data_imported)
+def invalidate_imported(sender, models, **kwargs):
+    """
+    Массовая загрузка идёт в обход post_save и m2m_changed, поэтому
+    версии сбрасываются здесь разом по всем загруженным моделям.
+    """
+    models = set(models)
+    if Review in models or Title.genre.through in models:
+        # Отзывы меняют рейтинг, связи - жанры произведений.
+        models.add(Title)
+    for model in models:
+        if model in COUNTED_MODELS:
+            bump_on_commit(COUNT_NAMESPACE, model)
+        if model in FACET_MODELS:
+            bump_on_commit(FACET_NAMESPACE, model)
+        if model in (Title, Genre, Category):
+            bump_on_commit(RESPONSE_NAMESPACE, model)
+    if Title in models:
+        # Версия жанров входит в ключи всех карточек произведений.
+        bump_on_commit(RESPONSE_NAMESPACE, Genre)
@@ -2,9 +2,11 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    cache_stats,
     CategoryViewSet,
     CommentViewSet,
     GenreViewSet,
+    review_batch,
     TitleViewSet,
     ReviewViewSet,
 )
@@ -30,7 +32,13 @@ v1_router.register(
     basename="comments",
 )
 
+v1_urlpatterns = [
+    path("v1/auth/token/", get_jwt_token),
+    path("v1/cache/stats/", cache_stats),
+    path("v1/reviews/batch/", review_batch),
+]
+
 urlpatterns = [
     path("v1/", include(v1_router.urls)),
-    path("v1/auth/token/", get_jwt_token),
+    *v1_urlpatterns,
 ]
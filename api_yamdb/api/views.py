@@ -1,14 +1,24 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 
-from rest_framework import filters, mixins, viewsets
-
-from reviews.models import Category, Genre, Review, Title
-from .filters import TitleFilterBackend
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from .batch import create_reviews
+from .cache import CachedListMixin, CachedRetrieveMixin, response_stats
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from .facets import get_facet_index, mask_of
+from .filters import TitleFilterBackend, TitleSearchFilter
+from .pagination import CachedCountPagination, FeedPagination
 from .permissions import (
     IsAdminOrReadOnly,
+    IsAdminOrSuperuser,
     IsOwnerOrModeratorOrAdmin,
 )
 from .serializers import (
@@ -26,13 +36,24 @@ User = get_user_model()
 methods = ["get", "post", "patch", "delete"]
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    CachedListMixin,
+    CachedRetrieveMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
-        Title.objects.all().annotate(
-            rating=Avg("reviews__score")).order_by("name")
+        Title.objects.select_related("category")
+        .prefetch_related("genre").order_by("name")
     )
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = [DjangoFilterBackend]
+    pagination_class = CachedCountPagination
+    count_cache_models = (Title, Genre, Category)
+    response_cache_name = "titles"
+    response_cache_models = (Title, Genre, Category)
+    response_cache_detail_models = (Genre, Category)
+    filter_backends = [DjangoFilterBackend, TitleSearchFilter]
     filterset_class = TitleFilterBackend
     http_method_names = methods
 
@@ -41,8 +62,41 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleReadSerializer
         return TitleSerializer
 
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        Число произведений по жанрам, категориям и годам для текущих
+        фильтров. Фильтры genre, category и year считаются по индексу
+        фасетов, name и search сужают выборку запросом к базе.
+        """
+        filterset = TitleFilterBackend(
+            request.query_params, queryset=Title.objects.all(),
+            request=request,
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        data = filterset.form.cleaned_data
+        base = None
+        if data.get("name") or request.query_params.get("search"):
+            queryset = Title.objects.all()
+            if data.get("name"):
+                queryset = queryset.filter(name__contains=data["name"])
+            queryset = TitleSearchFilter().filter_queryset(
+                request, queryset, self
+            )
+            base = mask_of(queryset.values_list("id", flat=True))
+        year = data.get("year")
+        return Response(get_facet_index().facets(
+            base=base,
+            genres=data.get("genre"),
+            genre_mode=data.get("genre_mode") or "any",
+            categories=data.get("category"),
+            year=int(year) if year is not None else None,
+        ))
+
 
 class CategoryViewSet(
+    CachedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -51,6 +105,9 @@ class CategoryViewSet(
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = CachedCountPagination
+    response_cache_name = "categories"
+    response_cache_models = (Category,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
     lookup_field = "slug"
@@ -58,6 +115,7 @@ class CategoryViewSet(
 
 
 class GenreViewSet(
+    CachedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -66,36 +124,117 @@ class GenreViewSet(
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = CachedCountPagination
+    response_cache_name = "genres"
+    response_cache_models = (Genre,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
     lookup_field = "slug"
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = ReviewSerializer
     permission_classes = (IsOwnerOrModeratorOrAdmin,)
+    pagination_class = FeedPagination
     http_method_names = methods
+    # В ответе есть название произведения, поэтому его updated_at
+    # тоже входит в ETag.
+    validator_fields = ("updated_at", "title__updated_at", "pub_date")
+    _title = None
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get("title_id"))
+        """Произведение из URL, один запрос на весь запрос к API."""
+        if self._title is None:
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get("title_id")
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        queryset = Review.objects.select_related("author", "title")
+        if self.detail:
+            # Произведение проверяется тем же запросом, что ищет отзыв.
+            return queryset.filter(title_id=self.kwargs.get("title_id"))
+        return queryset.filter(title=self.get_title())
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_title())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = CommentSerializer
     permission_classes = (IsOwnerOrModeratorOrAdmin,)
+    pagination_class = FeedPagination
     http_method_names = methods
+    validator_fields = ("updated_at", "pub_date")
+    _review = None
 
     def get_review(self):
-        return get_object_or_404(Review, pk=self.kwargs.get("review_id"))
+        """
+        Отзыв из URL, который должен принадлежать произведению из URL.
+        Один запрос на весь запрос к API.
+        """
+        if self._review is None:
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get("review_id"),
+                title_id=self.kwargs.get("title_id"),
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        queryset = Comment.objects.select_related("author")
+        if self.detail:
+            return queryset.filter(
+                review_id=self.kwargs.get("review_id"),
+                review__title_id=self.kwargs.get("title_id"),
+            )
+        return queryset.filter(review=self.get_review())
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminOrSuperuser])
+def cache_stats(request):
+    """Счётчики попаданий и промахов кеша ответов."""
+    names = [
+        view.response_cache_name
+        for view in (TitleViewSet, CategoryViewSet, GenreViewSet)
+    ]
+    return Response(response_stats(names))
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def review_batch(request):
+    """
+    Пакетное создание отзывов: список {title_id, text, score}.
+    Отвечает 201, если созданы все отзывы, иначе 207 с результатом
+    по каждому элементу.
+    """
+    items = request.data
+    if not isinstance(items, list) or not items:
+        raise ValidationError("Ожидается непустой список отзывов")
+    if len(items) > settings.REVIEW_BATCH_MAX_SIZE:
+        raise ValidationError(
+            f"Не больше {settings.REVIEW_BATCH_MAX_SIZE} отзывов за запрос"
+        )
+    results = create_reviews(request.user, items)
+    created = sum("id" in result for result in results)
+    return Response(
+        {"created": created, "results": results},
+        status=(
+            status.HTTP_201_CREATED if created == len(results)
+            else status.HTTP_207_MULTI_STATUS
+        ),
+    )
@@ -0,0 +1,11 @@
+"""
+URLconf запросов, пришедших через ASGI (см. api.async_views).
+"""
+from django.urls import include, path
+
+from .urls import site_urlpatterns
+
+urlpatterns = [
+    path("api/", include("api.async_urls")),
+    *site_urlpatterns,
+]
@@ -0,0 +1,32 @@
+"""
+Настройка соединений с SQLite.
+
+configure_sqlite подключается к сигналу connection_created в
+ProjectConfig.ready() и применяет settings.SQLITE_PRAGMAS. При
+CONN_MAX_AGE=0 соединение открывается на каждый запрос, поэтому
+PRAGMA, которые сохраняются в файле базы (journal_mode=WAL), процесс
+выполняет для каждой базы один раз: их повтор требует блокировки
+базы и ничего не меняет. Остальные действуют только на соединение и
+выполняются каждый раз.
+"""
+from django.conf import settings
+
+
+PERSISTENT_PRAGMAS = ("journal_mode",)
+
+_persistent_applied = set()
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Применяет settings.SQLITE_PRAGMAS к новому соединению с SQLite."""
+    if connection.vendor != "sqlite":
+        return
+    database = connection.settings_dict["NAME"]
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            key = (database, name, value)
+            if name in PERSISTENT_PRAGMAS:
+                if key in _persistent_applied:
+                    continue
+                _persistent_applied.add(key)
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,102 @@
+"""
+PostgreSQL-бэкенд с пулом соединений внутри процесса.
+
+Django открывает соединение при первом запросе к базе и закрывает его
+в конце HTTP-запроса (или по истечении CONN_MAX_AGE). Этот бэкенд
+вместо нового подключения берёт соединение из пула, а закрытие
+возвращает его в пул: TCP-подключение и аутентификация в PostgreSQL
+выполняются один раз на соединение пула, а не на каждый запрос.
+
+Параметры пула задаются ключом POOL в DATABASES:
+
+* MIN_SIZE, MAX_SIZE - сколько соединений пул открывает сразу и
+  сколько может держать всего;
+* TIMEOUT - сколько секунд ждать свободного соединения;
+* CHECK_AFTER - соединение, пролежавшее в пуле дольше этого числа
+  секунд, перед выдачей проверяется запросом SELECT 1, мёртвое
+  закрывается и заменяется новым.
+"""
+import threading
+
+from django.db.backends.postgresql import base, creation
+from django.utils.asyncio import async_unsafe
+from psycopg2 import extras
+
+from .pool import ConnectionPool
+
+
+POOL_DEFAULTS = {
+    "MIN_SIZE": 1,
+    "MAX_SIZE": 10,
+    "TIMEOUT": 30,
+    "CHECK_AFTER": 30,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(settings_dict, conn_params):
+    options = {**POOL_DEFAULTS, **settings_dict.get("POOL", {})}
+    # Пул привязан к параметрам подключения, а не к алиасу: тестовый
+    # раннер меняет NAME, и соединения к старой базе выдаваться не должны.
+    key = (
+        tuple(sorted(conn_params.items())),
+        settings_dict["OPTIONS"].get("isolation_level"),
+    )
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                conn_params,
+                min_size=options["MIN_SIZE"],
+                max_size=options["MAX_SIZE"],
+                timeout=options["TIMEOUT"],
+                check_after=options["CHECK_AFTER"],
+            )
+        return _pools[key]
+
+
+def close_pools(database=None):
+    """
+    Закрывает пулы соединений с базой database (по умолчанию все).
+    """
+    with _pools_lock:
+        for key, connection_pool in list(_pools.items()):
+            if database is None or connection_pool.database == database:
+                connection_pool.close()
+                del _pools[key]
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # DROP DATABASE не пройдёт, пока в пуле есть соединения с ней.
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.settings_dict, conn_params)
+        connection = self.pool.getconn()
+        # Дальше то же, что в base.DatabaseWrapper.get_new_connection
+        # после Database.connect().
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,134 @@
+"""
+Пул соединений psycopg2, которым пользуется бэкенд postgresql_pool.
+
+Модуль не импортирует PostgreSQL-бэкенд Django, поэтому пул можно
+проверять без сервера PostgreSQL.
+"""
+import collections
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions, pool
+
+
+class ConnectionPool:
+    """
+    Держит до max_size соединений с базой.
+
+    Свободные соединения хранятся в пуле вместе с моментом возврата,
+    пока их не больше max_size: ThreadedConnectionPool из psycopg2
+    оставлял себе только minconn соединений, а остальные закрывал при
+    возврате, и под нагрузкой пул снова подключался к базе на каждый
+    запрос.
+    """
+
+    def __init__(self, conn_params, min_size, max_size, timeout, check_after):
+        self.conn_params = conn_params
+        self.database = conn_params["database"]
+        # Ограничивает число выданных соединений: getconn ждёт свободное
+        # до timeout секунд, а не открывает сверх max_size.
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.timeout = timeout
+        self.check_after = check_after
+        self.lock = threading.Lock()
+        self.idle = collections.deque()
+        self.used = set()
+        self.closed = False
+        returned_at = time.monotonic()
+        for _ in range(min_size):
+            self.idle.append((self.connect(), returned_at))
+
+    def connect(self):
+        return psycopg2.connect(**self.conn_params)
+
+    def getconn(self):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise pool.PoolError(
+                f"Нет свободного соединения с {self.database} "
+                f"за {self.timeout} с"
+            )
+        try:
+            connection = self.take_idle()
+            if connection is None:
+                connection = self.connect()
+            with self.lock:
+                if self.closed:
+                    raise pool.PoolError("Пул соединений закрыт")
+                self.used.add(connection)
+        except BaseException:
+            self.slots.release()
+            raise
+        return connection
+
+    def take_idle(self):
+        """
+        Возвращает рабочее свободное соединение или None.
+
+        Берётся последнее возвращённое: оно реже всего требует проверки,
+        а давно лежащие в начале очереди закрываются, если умерли.
+        """
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                connection, returned_at = self.idle.pop()
+            if self.is_usable(connection, returned_at):
+                return connection
+            self.discard(connection)
+
+    def putconn(self, connection):
+        close = bool(connection.closed)
+        if not close:
+            try:
+                status = connection.get_transaction_status()
+                if status != extensions.TRANSACTION_STATUS_IDLE:
+                    # Незавершённая транзакция не должна достаться
+                    # следующему запросу.
+                    connection.rollback()
+            except psycopg2.Error:
+                close = True
+        try:
+            with self.lock:
+                self.used.discard(connection)
+                # Выданных соединений не больше max_size, поэтому и
+                # свободных не накопится больше.
+                keep = not close and not self.closed
+                if keep:
+                    self.idle.append((connection, time.monotonic()))
+            if not keep:
+                self.discard(connection)
+        finally:
+            self.slots.release()
+
+    def is_usable(self, connection, returned_at):
+        if connection.closed:
+            return False
+        if time.monotonic() - returned_at < self.check_after:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except psycopg2.Error:
+            return False
+        return True
+
+    def discard(self, connection):
+        if not connection.closed:
+            try:
+                connection.close()
+            except psycopg2.Error:
+                pass
+
+    def close(self):
+        """
+        Закрывает все соединения пула, в том числе выданные.
+        """
+        with self.lock:
+            self.closed = True
+            connections = [connection for connection, _ in self.idle]
+            connections.extend(self.used)
+            self.idle.clear()
+            self.used.clear()
+        for connection in connections:
+            self.discard(connection)
@@ -0,0 +1,139 @@
+"""
+Чтение с реплик базы данных.
+
+ReplicaRoutingMiddleware запоминает текущий запрос, а ReplicaRouter
+по нему выбирает базу: запросы GET и HEAD читают со случайной реплики
+из settings.DATABASE_REPLICAS, остальные запросы и любой код вне
+запроса (команды, воркеры) работают с default.
+
+Реплика отстаёт от основной базы, поэтому после успешного
+изменяющего запроса пользователь REPLICA_STICKY_TIMEOUT секунд читает
+с default и сразу видит, например, только что созданный отзыв. Метка
+хранится в кеше, и для нескольких процессов нужен общий кеш (redis).
+"""
+import asyncio
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import SimpleLazyObject
+
+
+READ_METHODS = ("GET", "HEAD")
+
+_current_request = ContextVar("replica_request", default=None)
+_force_primary = ContextVar("replica_force_primary", default=False)
+
+
+def sticky_key(user_id):
+    return f"replica-sticky:{user_id}"
+
+
+def resolved_user(request):
+    """
+    Пользователь запроса, если он уже известен. До аутентификации в
+    DRF request.user - ленивый объект AuthenticationMiddleware, и его
+    вычисление само читало бы базу.
+    """
+    user = vars(request).get("user")
+    if user is None or isinstance(user, SimpleLazyObject):
+        return None
+    return user
+
+
+def is_sticky(request):
+    if "_replica_sticky" in vars(request):
+        return request._replica_sticky
+    user = resolved_user(request)
+    if user is None:
+        return False
+    request._replica_sticky = user.is_authenticated and bool(
+        cache.get(sticky_key(user.pk))
+    )
+    return request._replica_sticky
+
+
+@contextmanager
+def use_primary():
+    """Чтение внутри блока идёт с default, даже в GET-запросе."""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        request = _current_request.get()
+        if request is None or not settings.DATABASE_REPLICAS:
+            return None
+        if (
+            request.method not in READ_METHODS
+            or _force_primary.get()
+            or is_sticky(request)
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        # Без роутера объект, прочитанный с реплики, сохранялся бы туда же.
+        instance = hints.get("instance")
+        if (
+            instance is not None
+            and instance._state.db in settings.DATABASE_REPLICAS
+        ):
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Как в MiddlewareMixin: под ASGI middleware - корутина и не
+            # занимает единственный поток синхронного кода.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = _current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        self.mark_sticky(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = _current_request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        if request.method not in READ_METHODS:
+            await sync_to_async(self.mark_sticky)(request, response)
+        return response
+
+    def mark_sticky(self, request, response):
+        if request.method in READ_METHODS or response.status_code >= 400:
+            return
+        user = resolved_user(request)
+        if user is not None and user.is_authenticated:
+            cache.set(
+                sticky_key(user.pk), True, settings.REPLICA_STICKY_TIMEOUT
+            )
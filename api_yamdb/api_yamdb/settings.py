@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "api_yamdb.apps.ProjectConfig",
     "api.apps.ApiConfig",
     "reviews.apps.ReviewsConfig",
     "users.apps.UsersConfig",
@@ -36,6 +37,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api_yamdb.replicas.ReplicaRoutingMiddleware",
+    "api.async_views.AsyncReadMiddleware",
 ]
 
 ROOT_URLCONF = "api_yamdb.urls"
@@ -60,15 +63,86 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "api_yamdb.wsgi.application"
 
+# Под ASGI чтение произведений, отзывов и комментариев идёт через
+# асинхронные представления (api.async_views) в пуле из
+# ASYNC_READ_THREADS потоков.
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "1") == "1"
+ASYNC_URLCONF = "api_yamdb.async_urls"
+ASYNC_READ_THREADS = int(os.getenv("ASYNC_READ_THREADS", 16))
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        # 'NAME': BASE_DIR / 'db.sqlite3',
-        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+
+# СУБД выбирается переменной окружения DB_ENGINE: sqlite (по умолчанию)
+# или postgresql (нужен пакет psycopg2-binary). DB_POOL=1 включает для
+# PostgreSQL пул соединений внутри процесса (api_yamdb.postgresql_pool).
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+DB_POOL = os.getenv("DB_POOL", "0") == "1"
+
+if DB_ENGINE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME", os.path.join(BASE_DIR, "db.sqlite3")),
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": (
+                "api_yamdb.postgresql_pool" if DB_POOL
+                else "django.db.backends.postgresql"
+            ),
+            "NAME": os.getenv("DB_NAME", "yamdb"),
+            "USER": os.getenv("DB_USER", "postgres"),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "127.0.0.1"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            "POOL": {
+                "MIN_SIZE": int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+                "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+                "CHECK_AFTER": float(os.getenv("DB_POOL_CHECK_AFTER", 30)),
+            },
+        }
     }
+
+# PRAGMA для каждого нового соединения с SQLite (api_yamdb.db).
+# В режиме WAL читатели не ждут писателя, а synchronous=NORMAL не
+# теряет целостность базы; busy_timeout - сколько миллисекунд ждать
+# блокировку вместо ошибки "database is locked"; cache_size в КиБ,
+# если отрицательный.
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -32 * 1024,
 }
 
+# Сколько секунд Django держит соединение открытым между запросами;
+# 0 - новое соединение на каждый запрос. С пулом оставьте 0: закрытие
+# в конце запроса возвращает соединение в пул.
+DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv(
+    "DB_CONN_MAX_AGE", 60 if DB_ENGINE != "sqlite" and not DB_POOL else 0
+))
+
+# Реплики для чтения (api_yamdb.replicas): DB_REPLICAS - через запятую
+# файлы SQLite или хосты PostgreSQL. Остальные параметры - как у default.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(os.getenv("DB_REPLICAS", "").split(","), 1):
+    if replica:
+        DATABASES[f"replica{number}"] = {
+            **DATABASES["default"],
+            "NAME" if DB_ENGINE == "sqlite" else "HOST": replica,
+            "TEST": {"MIRROR": "default"},
+        }
+        DATABASE_REPLICAS.append(f"replica{number}")
+
+DATABASE_ROUTERS = ["api_yamdb.replicas.ReplicaRouter"]
+
+# Сколько секунд после изменяющего запроса пользователь читает с
+# основной базы, а не с реплики.
+REPLICA_STICKY_TIMEOUT = 5
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -108,17 +182,84 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # JSON через orjson, если он установлен (api.renderers).
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
+# Бэкенд кеша выбирается переменной окружения CACHE_BACKEND:
+# locmem (по умолчанию), file или redis (нужен пакет django-redis).
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django_redis.cache.RedisCache",
+}
+CACHE_LOCATIONS = {
+    "locmem": "yamdb",
+    "file": os.path.join(BASE_DIR, "cache"),
+    "redis": "redis://127.0.0.1:6379/1",
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION", CACHE_LOCATIONS[CACHE_BACKEND]
+        ),
+    }
+}
+
+# Время жизни ответов в кеше анонимных GET-запросов, секунды.
+RESPONSE_CACHE_TIMEOUT = 60
+
+# Время жизни закешированного count в пагинации списков, секунды.
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+# Для списков без фильтров отдавать оценку числа строк по статистике
+# таблицы (PostgreSQL), если она больше порога. None - всегда точный count.
+PAGINATION_ESTIMATE_COUNT_OVER = None
+
+# Время жизни индекса фасетов /titles/facets/ в кеше, секунды. Индекс
+# перестраивается и раньше - при любом изменении произведений, жанров
+# и категорий.
+FACET_INDEX_CACHE_TIMEOUT = 60 * 60
+
+# Максимум отзывов в одном запросе к /api/v1/reviews/batch/.
+REVIEW_BATCH_MAX_SIZE = 500
+
+# Время жизни пользователя в кеше CachedJWTAuthentication, секунды.
+JWT_USER_CACHE_TIMEOUT = 60
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Время действия кода подтверждения из письма, секунды.
+CONFIRMATION_CODE_TIMEOUT = 24 * 60 * 60
+
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 EMAIL_NAME = "apipython@mail.ru"
+
+# Очередь исходящих писем (users.mail): outbox - таблица OutboxEmail,
+# которую отправляет команда send_queued_mail; thread - пул потоков
+# процесса, для разработки; sync - отправка сразу в запросе. Можно
+# указать и путь к своему классу очереди.
+MAIL_QUEUE = os.getenv("MAIL_QUEUE", "outbox")
+MAIL_QUEUE_THREADS = 2
+# Пауза перед повторной отправкой из outbox удваивается с каждой
+# неудачной попыткой, секунды.
+MAIL_RETRY_DELAY = 60
+MAIL_MAX_ATTEMPTS = 5
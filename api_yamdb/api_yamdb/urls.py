@@ -2,9 +2,13 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
-urlpatterns = [
-    path("api/", include("api.urls")),
+site_urlpatterns = [
     path("admin/", admin.site.urls),
     path("redoc/", TemplateView.as_view(template_name="redoc.html"),
          name="redoc"),
 ]
+
+urlpatterns = [
+    path("api/", include("api.urls")),
+    *site_urlpatterns,
+]
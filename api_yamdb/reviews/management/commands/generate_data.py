@@ -0,0 +1,197 @@
+import csv
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+
+ROLES = ("user", "user", "user", "user", "moderator", "admin")
+DATE_RANGE_DAYS = 5 * 365
+
+
+def zipf_counts(total, buckets, skew, limit, rng):
+    """
+    Распределяет total объектов по buckets корзинам по закону Ципфа:
+    корзина с рангом k получает долю, пропорциональную 1 / k ** skew.
+    При skew=0 распределение равномерное. Ни одна корзина не получает
+    больше limit объектов.
+    """
+    if not buckets:
+        return []
+    weights = [1 / (rank ** skew) for rank in range(1, buckets + 1)]
+    scale = total / sum(weights)
+    counts = [min(limit, int(weight * scale)) for weight in weights]
+    # Остаток от округления раздаём случайным корзинам, где есть место.
+    remainder = total - sum(counts)
+    while remainder > 0:
+        candidates = [idx for idx, count in enumerate(counts) if count < limit]
+        if not candidates:
+            break
+        for idx in rng.sample(candidates, min(remainder, len(candidates))):
+            counts[idx] += 1
+            remainder -= 1
+    rng.shuffle(counts)
+    return counts
+
+
+def random_date(rng, now):
+    moment = now - timedelta(seconds=rng.randrange(DATE_RANGE_DAYS * 86400))
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+class CsvWriter:
+    """Пишет файлы в формате static/data, который читает import_csv."""
+
+    def __init__(self, path):
+        self.path = path
+        self.files = []
+
+    def write(self, name, header, rows):
+        count = 0
+        with open(os.path.join(self.path, name), "w",
+                  encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        self.files.append((name, count))
+        return count
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует синтетический набор данных заданного размера: "
+        "пользователей, произведения, жанры, отзывы и комментарии"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--titles", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=10)
+        parser.add_argument("--genres", type=int, default=30)
+        parser.add_argument(
+            "--reviews-per-title", type=float, default=20,
+            help="Среднее число отзывов на произведение",
+        )
+        parser.add_argument(
+            "--comments-per-review", type=float, default=2,
+            help="Среднее число комментариев на отзыв",
+        )
+        parser.add_argument(
+            "--skew", type=float, default=1.0,
+            help="Показатель Ципфа для распределения отзывов и "
+                 "комментариев (0 - равномерно)",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            help="Только записать CSV-файлы в каталог, не загружая в базу",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Передаётся в import_csv при загрузке",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("users", "titles", "categories", "genres"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} должен быть положительным")
+        if options["output"]:
+            os.makedirs(options["output"], exist_ok=True)
+            self.generate(options["output"], options)
+            return
+        with tempfile.TemporaryDirectory() as path:
+            self.generate(path, options)
+            call_command(
+                "import_csv",
+                path=path,
+                batch_size=options["batch_size"],
+                stdout=self.stdout,
+            )
+
+    def generate(self, path, options):
+        rng = random.Random(options["seed"])
+        now = datetime.now(timezone.utc)
+        writer = CsvWriter(path)
+        users = options["users"]
+        titles = options["titles"]
+        categories = options["categories"]
+        genres = options["genres"]
+
+        writer.write(
+            "category.csv", ("id", "name", "slug"),
+            ((idx, f"Категория {idx}", f"category-{idx}")
+             for idx in range(1, categories + 1)),
+        )
+        writer.write(
+            "genre.csv", ("id", "name", "slug"),
+            ((idx, f"Жанр {idx}", f"genre-{idx}")
+             for idx in range(1, genres + 1)),
+        )
+        writer.write(
+            "titles.csv", ("id", "name", "year", "category"),
+            ((idx, f"Произведение {idx}", rng.randint(1900, now.year),
+              rng.randint(1, categories))
+             for idx in range(1, titles + 1)),
+        )
+        writer.write(
+            "genre_title.csv", ("id", "title_id", "genre_id"),
+            self.genre_title_rows(rng, titles, genres),
+        )
+        writer.write(
+            "users.csv",
+            ("id", "username", "email", "role", "bio",
+             "first_name", "last_name"),
+            ((idx, f"user{idx}", f"user{idx}@yamdb.fake", rng.choice(ROLES),
+              "", "", "")
+             for idx in range(1, users + 1)),
+        )
+        review_counts = zipf_counts(
+            int(titles * options["reviews_per_title"]),
+            titles, options["skew"], users, rng,
+        )
+        reviews = writer.write(
+            "review.csv",
+            ("id", "title_id", "text", "author", "score", "pub_date"),
+            self.review_rows(rng, now, review_counts, users),
+        )
+        comments = int(reviews * options["comments_per_review"])
+        comment_counts = zipf_counts(
+            comments, reviews, options["skew"], comments, rng
+        )
+        writer.write(
+            "comments.csv",
+            ("id", "review_id", "text", "author", "pub_date"),
+            self.comment_rows(rng, now, comment_counts, users),
+        )
+        for name, count in writer.files:
+            self.stdout.write(f"{name}: {count} rows")
+
+    def genre_title_rows(self, rng, titles, genres):
+        row_id = 0
+        for title_id in range(1, titles + 1):
+            for genre_id in rng.sample(
+                range(1, genres + 1), min(genres, rng.randint(1, 3))
+            ):
+                row_id += 1
+                yield row_id, title_id, genre_id
+
+    def review_rows(self, rng, now, counts, users):
+        row_id = 0
+        for title_id, count in enumerate(counts, 1):
+            for author_id in rng.sample(range(1, users + 1), count):
+                row_id += 1
+                yield (row_id, title_id, f"Отзыв {row_id}", author_id,
+                       rng.randint(1, 10), random_date(rng, now))
+
+    def comment_rows(self, rng, now, counts, users):
+        row_id = 0
+        for review_id, count in enumerate(counts, 1):
+            for _ in range(count):
+                row_id += 1
+                yield (row_id, review_id, f"Комментарий {row_id}",
+                       rng.randint(1, users), random_date(rng, now))
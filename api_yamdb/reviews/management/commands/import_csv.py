@@ -1,97 +1,343 @@
 import csv
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from itertools import islice
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-
-from reviews.models import (Category, Comment, Genre,
-                            GenreTitle, Review, Title, User)
-
-
-def category_create(row):
-    Category.objects.get_or_create(
-        id=row[0],
-        name=row[1],
-        slug=row[2],
-    )
-
-
-def genre_create(row):
-    Genre.objects.get_or_create(
-        id=row[0],
-        name=row[1],
-        slug=row[2],
-    )
-
-
-def titles_create(row):
-    Title.objects.get_or_create(
-        id=row[0],
-        name=row[1],
-        year=row[2],
-        category_id=row[3],
-    )
-
-
-def genre_title_create(row):
-    GenreTitle.objects.get_or_create(
-        id=row[0],
-        title_id=row[1],
-        genre_id=row[2],
-    )
-
-
-def users_create(row):
-    User.objects.get_or_create(
-        id=row[0],
-        username=row[1],
-        email=row[2],
-        role=row[3],
-        first_name=row[4],
-        last_name=row[5],
-        bio=row[6],
-    )
-
-
-def review_create(row):
-    Review.objects.get_or_create(
-        id=row[0],
-        title_id=row[1],
-        text=row[2],
-        author_id=row[3],
-        score=row[4],
-        pub_date=row[5],
-    )
-
-
-def comment_create(row):
-    Comment.objects.get_or_create(
-        id=row[0],
-        review_id=row[1],
-        text=row[2],
-        author_id=row[3],
-        pub_date=row[4],
-    )
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, models, transaction
 
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.signals import data_imported
 
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Имя файла -> модель и соответствие колонок CSV полям модели.
+# При последовательной загрузке порядок важен: внешние ключи
+# должны ссылаться на уже загруженные строки.
+# Связи жанров загружаются в таблицу Title.genre, которую читают
+# фильтры и фасеты API, а не в отдельную модель GenreTitle.
 csv_files = {
-    "category.csv": category_create,
-    "genre.csv": genre_create,
-    "titles.csv": titles_create,
-    "genre_title.csv": genre_title_create,
-    "users.csv": users_create,
-    "review.csv": review_create,
-    "comments.csv": comment_create,
+    "category.csv": (Category, {"id": "id", "name": "name", "slug": "slug"}),
+    "genre.csv": (Genre, {"id": "id", "name": "name", "slug": "slug"}),
+    "titles.csv": (
+        Title,
+        {"id": "id", "name": "name", "year": "year",
+         "category": "category_id"},
+    ),
+    "genre_title.csv": (
+        Title.genre.through,
+        {"id": "id", "title_id": "title_id", "genre_id": "genre_id"},
+    ),
+    "users.csv": (
+        User,
+        {"id": "id", "username": "username", "email": "email",
+         "role": "role", "bio": "bio", "first_name": "first_name",
+         "last_name": "last_name"},
+    ),
+    "review.csv": (
+        Review,
+        {"id": "id", "title_id": "title_id", "text": "text",
+         "author": "author_id", "score": "score", "pub_date": "pub_date"},
+    ),
+    "comments.csv": (
+        Comment,
+        {"id": "id", "review_id": "review_id", "text": "text",
+         "author": "author_id", "pub_date": "pub_date"},
+    ),
+}
+
+
+@contextmanager
+def preserve_auto_now_add(model):
+    """
+    Отключает auto_now_add на время импорта, чтобы даты
+    публикации брались из CSV, а не проставлялись текущими.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def read_objects(file, model, columns):
+    """Лениво превращает строки CSV в несохранённые объекты модели."""
+    reader = csv.DictReader(file)
+    for row in reader:
+        values = {}
+        for column, attname in columns.items():
+            value = row[column]
+            if attname.endswith("_id") and value == "":
+                value = None
+            values[attname] = value
+        yield model(**values)
+
+
+def import_file(file_path, model, columns, batch_size):
+    """Загружает один файл пачками в одной транзакции."""
+    rows = 0
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        objects = read_objects(f, model, columns)
+        with transaction.atomic(), preserve_auto_now_add(model):
+            while True:
+                batch = list(islice(objects, batch_size))
+                if not batch:
+                    break
+                model.objects.bulk_create(batch, ignore_conflicts=True)
+                rows += len(batch)
+    return rows
+
+
+def copy_file(file_path, model, columns, batch_size):
+    """
+    Быстрая загрузка для PostgreSQL: файл целиком передаётся в
+    промежуточную таблицу через COPY FROM STDIN и переносится
+    в основную одним INSERT ... ON CONFLICT DO NOTHING.
+    batch_size не используется: COPY читает поток сам.
+    """
+    opts = model._meta
+    quote = connection.ops.quote_name
+    table = quote(opts.db_table)
+    staging = quote(f"{opts.db_table}_staging")
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader([f.readline()]))
+        fields = [opts.get_field(columns[column]) for column in header]
+        csv_columns = ", ".join(quote(field.column) for field in fields)
+        not_null = ", ".join(
+            quote(field.column) for field in fields
+            if not field.null
+            and isinstance(field, (models.CharField, models.TextField))
+        )
+        copy_options = "FORMAT csv"
+        if not_null:
+            copy_options += f", FORCE_NOT_NULL ({not_null})"
+        # Поля, которых нет в CSV, но которые NOT NULL в базе
+        # (например, password у пользователей или updated_at),
+        # берут значения, которые ORM подставил бы при создании объекта.
+        extra_fields = [
+            field for field in opts.concrete_fields
+            if field not in fields and not field.primary_key
+            and (field.has_default() or not field.null)
+        ]
+        extra_columns = "".join(
+            f", {quote(field.column)}" for field in extra_fields
+        )
+        template = model()
+        extra_values = [
+            field.get_db_prep_save(field.pre_save(template, True), connection)
+            for field in extra_fields
+        ]
+        placeholders = ", %s" * len(extra_fields)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {csv_columns} FROM {table} WITH NO DATA"
+            )
+            cursor.copy_expert(
+                f"COPY {staging} ({csv_columns}) FROM STDIN "
+                f"WITH ({copy_options})",
+                f,
+            )
+            cursor.execute(f"SELECT count(*) FROM {staging}")
+            rows = cursor.fetchone()[0]
+            cursor.execute(
+                f"INSERT INTO {table} ({csv_columns}{extra_columns}) "
+                f"SELECT {csv_columns}{placeholders} FROM {staging} "
+                "ON CONFLICT DO NOTHING",
+                extra_values,
+            )
+    return rows
+
+
+ENGINES = {
+    "orm": import_file,
+    "copy": copy_file,
 }
 
 
+def supports_copy():
+    return connection.vendor == "postgresql"
+
+
+def timed_import(engine, file_path, model, columns, batch_size):
+    started = time.monotonic()
+    rows = ENGINES[engine](file_path, model, columns, batch_size)
+    return rows, time.monotonic() - started
+
+
+def threaded_import(*args):
+    """
+    Обёртка для запуска в пуле потоков: у каждого потока своё
+    соединение с БД, которое закрывается по окончании загрузки.
+    """
+    try:
+        return timed_import(*args)
+    finally:
+        connections.close_all()
+
+
+def build_dependencies(names):
+    """
+    Строит граф зависимостей между файлами по внешним ключам моделей:
+    файл ждёт загрузки всех файлов, на модели которых он ссылается.
+    """
+    file_by_model = {csv_files[name][0]: name for name in names}
+    dependencies = {}
+    for name in names:
+        model = csv_files[name][0]
+        dependencies[name] = {
+            file_by_model[field.related_model]
+            for field in model._meta.concrete_fields
+            if field.many_to_one
+            and field.related_model is not model
+            and field.related_model in file_by_model
+        }
+    return dependencies
+
+
+def supports_parallel_import():
+    # SQLite допускает только одного писателя на файл базы.
+    return connection.vendor != "sqlite"
+
+
+def reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
 class Command(BaseCommand):
+    help = "Импортирует данные из CSV-файлов в базу"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=os.path.join(settings.BASE_DIR, "static/data/"),
+            help="Каталог с CSV-файлами",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Число строк в одном INSERT",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=sorted(ENGINES),
+            default="orm",
+            help="Способ загрузки: orm (bulk_create) или copy (COPY, "
+                 "только PostgreSQL)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Число файлов, загружаемых одновременно",
+        )
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            metavar="NAME",
+            help="Загрузить только указанные файлы (например, genre review)",
+        )
+
+    def get_files(self, only):
+        if not only:
+            return list(csv_files)
+        names = [
+            name if name.endswith(".csv") else f"{name}.csv" for name in only
+        ]
+        unknown = set(names) - set(csv_files)
+        if unknown:
+            raise CommandError(
+                f"Неизвестные файлы: {', '.join(sorted(unknown))}"
+            )
+        return [name for name in csv_files if name in names]
+
     def handle(self, *args, **options):
-        path = os.path.join(settings.BASE_DIR, "static/data/")
-        for key in csv_files.keys():
-            with open(path + key, "r") as f:
-                reader = csv.reader(f)
-                next(reader)
-                for row in reader:
-                    csv_files[key](row)
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть положительным")
+        files = self.get_files(options["only"])
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers должен быть положительным")
+        if workers > 1 and not supports_parallel_import():
+            workers = 1
+        if options["engine"] == "copy" and not supports_copy():
+            self.stdout.write(self.style.WARNING(
+                "COPY доступен только для PostgreSQL, "
+                "используется загрузка через ORM"
+            ))
+            options["engine"] = "orm"
+        if workers == 1:
+            imported = self.import_sequential(files, options)
+        else:
+            imported = self.import_parallel(files, workers, options)
+        imported_models = [csv_files[name][0] for name in imported]
+        reset_sequences(imported_models)
+        if Review in imported_models:
+            Title.rebuild_ratings()
+        data_imported.send(sender=self.__class__, models=imported_models)
         self.stdout.write(self.style.SUCCESS("Data imported successfully"))
+
+    def import_args(self, name, options):
+        model, columns = csv_files[name]
+        return (
+            options["engine"],
+            os.path.join(options["path"], name),
+            model,
+            columns,
+            options["batch_size"],
+        )
+
+    def report(self, name, rows, elapsed):
+        self.stdout.write(
+            f"{name}: {rows} rows in {elapsed:.2f}s "
+            f"({rows / elapsed if elapsed else rows:.0f} rows/s)"
+        )
+
+    def import_sequential(self, files, options):
+        for name in files:
+            rows, elapsed = timed_import(*self.import_args(name, options))
+            self.report(name, rows, elapsed)
+        return files
+
+    def import_parallel(self, files, workers, options):
+        """
+        Загружает независимые файлы одновременно: файл ставится в очередь,
+        как только загружены все файлы, от которых он зависит.
+        """
+        pending = build_dependencies(files)
+        done = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            while pending or running:
+                ready = [name for name, deps in pending.items() if not deps]
+                for name in ready:
+                    del pending[name]
+                    future = executor.submit(
+                        threaded_import, *self.import_args(name, options)
+                    )
+                    running[future] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    rows, elapsed = future.result()
+                    self.report(name, rows, elapsed)
+                    done.append(name)
+                    for deps in pending.values():
+                        deps.discard(name)
+        return done
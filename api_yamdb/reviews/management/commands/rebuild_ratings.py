@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает сохранённые рейтинги произведений с нуля"
+
+    def handle(self, *args, **options):
+        updated = Title.rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Ratings rebuilt for {updated} titles")
+        )
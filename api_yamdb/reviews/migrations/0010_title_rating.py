@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-18 16:42
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    db_alias = schema_editor.connection.alias
+    titles = Title.objects.using(db_alias).annotate(
+        new_sum=Sum('reviews__score'), new_count=Count('reviews')
+    ).filter(new_count__gt=0)
+    for title in titles.iterator():
+        title.rating_sum = title.new_sum
+        title.rating_count = title.new_count
+        title.rating = title.new_sum / title.new_count
+        title.save(
+            using=db_alias,
+            update_fields=('rating_sum', 'rating_count', 'rating'),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_delete_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Число оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
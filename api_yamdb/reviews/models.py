@@ -1,6 +1,9 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
 
 
 User = get_user_model()
@@ -39,6 +42,10 @@ class Title(models.Model):
         Category, on_delete=models.SET_NULL,
         blank=True, null=True, related_name="title"
     )
+    rating_sum = models.PositiveIntegerField("Сумма оценок", default=0)
+    rating_count = models.PositiveIntegerField("Число оценок", default=0)
+    rating = models.FloatField("Рейтинг", null=True, blank=True)
+    updated_at = models.DateTimeField("Дата изменения", auto_now=True)
 
     class Meta:
         verbose_name = "Произведение"
@@ -47,6 +54,53 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def change_rating(cls, title_id, score_delta, count_delta):
+        """
+        Атомарно сдвигает сумму и число оценок произведения
+        и пересчитывает рейтинг одним UPDATE.
+        """
+        cls.objects.filter(pk=title_id).update(
+            rating_sum=F("rating_sum") + score_delta,
+            rating_count=F("rating_count") + count_delta,
+            rating=(
+                Cast(F("rating_sum") + score_delta, FloatField())
+                / NullIf(F("rating_count") + count_delta, 0)
+            ),
+            updated_at=timezone.now(),
+        )
+
+    @classmethod
+    def rebuild_ratings(cls, title_ids=None):
+        """
+        Пересчитывает сохранённый рейтинг с нуля по таблице отзывов.
+        Возвращает число обновлённых произведений.
+        """
+        titles = cls.objects.all()
+        if title_ids is not None:
+            titles = titles.filter(pk__in=title_ids)
+        titles = titles.annotate(
+            new_sum=Coalesce(Sum("reviews__score"), 0),
+            new_count=Count("reviews"),
+        ).only("id")
+        changed = []
+        now = timezone.now()
+        for title in titles.iterator():
+            title.rating_sum = title.new_sum
+            title.rating_count = title.new_count
+            title.rating = (
+                title.new_sum / title.new_count if title.new_count else None
+            )
+            title.updated_at = now
+            changed.append(title)
+        with transaction.atomic():
+            cls.objects.bulk_update(
+                changed,
+                ("rating_sum", "rating_count", "rating", "updated_at"),
+                batch_size=500,
+            )
+        return len(changed)
+
 
 class Review(models.Model):
     text = models.TextField("Текст")
@@ -64,6 +118,9 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True, verbose_name="Дата публикации", db_index=True
     )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name="Дата изменения"
+    )
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
@@ -75,7 +132,13 @@ class Review(models.Model):
     class Meta:
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
-        ordering = ("-pub_date",)
+        ordering = ("-pub_date", "-id")
+        indexes = (
+            models.Index(
+                fields=["title", "-pub_date", "-id"],
+                name="review_title_pub_date_idx",
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=["author", "title"], name="unique_author_title"
@@ -85,6 +148,21 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:15]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rating = (
+            instance.__dict__.get("title_id"), instance.__dict__.get("score")
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения обновляется в post_save,
+        # поэтому запись отзыва и пересчёт идут в одной транзакции.
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+        self._loaded_rating = (self.title_id, self.score)
+
 
 class Comment(models.Model):
     text = models.TextField("Текст")
@@ -95,6 +173,9 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True, verbose_name="Дата публикации", db_index=True
     )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name="Дата изменения"
+    )
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
@@ -105,7 +186,13 @@ class Comment(models.Model):
     class Meta:
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
-        ordering = ("-pub_date",)
+        ordering = ("-pub_date", "-id")
+        indexes = (
+            models.Index(
+                fields=["review", "-pub_date", "-id"],
+                name="comment_review_pub_date_idx",
+            ),
+        )
 
     def __str__(self):
         return self.text[:15]
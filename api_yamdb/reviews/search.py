@@ -0,0 +1,165 @@
+"""
+Полнотекстовый поиск по названию и описанию произведений.
+
+На SQLite индекс - FTS5-таблица title_search с внешним содержимым
+(content=reviews_title), которую поддерживают триггеры на вставку,
+изменение и удаление произведений. Так индекс остаётся актуальным и
+при bulk_create/import_csv, и при изменениях в обход ORM.
+
+На PostgreSQL - GIN-индексы по выражению tsvector и по триграммам
+названия (расширение pg_trgm): их поддерживает сама СУБД. На остальных
+СУБД поиск сводится к icontains по названию и описанию.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+
+SEARCH_TABLE = "title_search"
+MAX_TERMS = 8
+
+SQLITE_SETUP = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        name, description, content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+)
+SQLITE_TEARDOWN = (
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_update",
+    f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+)
+
+# Выражение индекса и запросов должно совпадать символ в символ,
+# иначе планировщик PostgreSQL не воспользуется индексом.
+PG_DOCUMENT = (
+    "(setweight(to_tsvector('simple', coalesce(reviews_title.name, '')), 'A')"
+    " || setweight(to_tsvector('simple', "
+    "coalesce(reviews_title.description, '')), 'B'))"
+)
+PG_SETUP = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS title_search_document_idx "
+    f"ON reviews_title USING gin ({PG_DOCUMENT})",
+    "CREATE INDEX IF NOT EXISTS title_search_name_trgm_idx "
+    "ON reviews_title USING gin (name gin_trgm_ops)",
+)
+PG_TEARDOWN = (
+    "DROP INDEX IF EXISTS title_search_document_idx",
+    "DROP INDEX IF EXISTS title_search_name_trgm_idx",
+)
+
+
+def create_search_index(schema_editor):
+    """
+    Создаёт поисковый индекс для текущей СУБД. Операции идемпотентны.
+    Миграции, которые пересоздают таблицу reviews_title на SQLite
+    (например, AlterField), удаляют её триггеры, поэтому после них
+    функцию нужно вызвать снова.
+    """
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_SETUP, "postgresql": PG_SETUP}
+    for sql in statements.get(vendor, ()):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_TEARDOWN, "postgresql": PG_TEARDOWN}
+    for sql in statements.get(vendor, ()):
+        schema_editor.execute(sql)
+
+
+def search_terms(query):
+    """Слова запроса без операторов и спецсимволов, не больше MAX_TERMS."""
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def search_titles(queryset, query):
+    """
+    Оставляет в queryset произведения, где встречаются все слова запроса
+    (последнее - как префикс), и сортирует их по релевантности.
+    Релевантность доступна в аннотации search_rank: чем больше, тем лучше.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        return search_sqlite(queryset, terms)
+    if vendor == "postgresql":
+        return search_postgresql(queryset, terms)
+    condition = Q()
+    for term in terms:
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition)
+
+
+def search_sqlite(queryset, terms):
+    # Каждое слово в кавычках - FTS5 не разбирает его как оператор.
+    match = " ".join(f'"{term}"' for term in terms) + "*"
+    # bm25() тем меньше, чем запись релевантнее; название весит больше.
+    return queryset.filter(
+        pk__in=RawSQL(
+            f"SELECT rowid FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s",
+            (match,),
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f"SELECT -bm25({SEARCH_TABLE}, 10.0, 1.0) FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s "
+            f"AND rowid = reviews_title.id",
+            (match,),
+            output_field=FloatField(),
+        )
+    ).order_by("-search_rank", "name")
+
+
+def search_postgresql(queryset, terms):
+    tsquery = " & ".join(terms) + ":*"
+    phrase = " ".join(terms)
+    return queryset.alias(
+        search_match=RawSQL(
+            f"{PG_DOCUMENT} @@ to_tsquery('simple', %s) "
+            f"OR reviews_title.name %% %s",
+            (tsquery, phrase),
+            output_field=BooleanField(),
+        )
+    ).filter(search_match=True).annotate(
+        search_rank=RawSQL(
+            f"ts_rank({PG_DOCUMENT}, to_tsquery('simple', %s)) "
+            f"+ similarity(reviews_title.name, %s)",
+            (tsquery, phrase),
+            output_field=FloatField(),
+        )
+    ).order_by("-search_rank", "name")
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .models import Category, Comment, Genre, Review, Title
+
+
+User = get_user_model()
+
+# Отправляется import_csv после загрузки: bulk_create и COPY не вызывают
+# post_save и m2m_changed. Аргумент models - загруженные модели.
+data_imported = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_title_rating_on_save(sender, instance, created, raw, **kwargs):
+    """Инкрементально обновляет рейтинг произведения при записи отзыва."""
+    if raw:
+        return
+    if created:
+        Title.change_rating(instance.title_id, instance.score, 1)
+        return
+    old_title_id, old_score = getattr(
+        instance, "_loaded_rating", (None, None)
+    )
+    if old_score is None:
+        Title.rebuild_ratings(title_ids=(instance.title_id,))
+        return
+    if old_title_id == instance.title_id:
+        if old_score != instance.score:
+            Title.change_rating(
+                instance.title_id, instance.score - old_score, 0
+            )
+        return
+    Title.change_rating(old_title_id, -old_score, -1)
+    Title.change_rating(instance.title_id, instance.score, 1)
+
+
+@receiver(post_delete, sender=Review)
+def update_title_rating_on_delete(sender, instance, **kwargs):
+    """Вычитает оценку удалённого отзыва из рейтинга произведения."""
+    Title.change_rating(instance.title_id, -instance.score, -1)
+
+
+# Ниже - поддержка updated_at для валидаторов условных GET-запросов:
+# ответ произведения включает категорию и жанры, а ответы отзывов
+# и комментариев - username автора. Время берётся из Python, а не
+# Now(): в SQLite CURRENT_TIMESTAMP имеет точность до секунды.
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, created=False, **kwargs):
+    if not created:
+        Title.objects.filter(category=instance).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, created=False, **kwargs):
+    if not created:
+        Title.objects.filter(genre=instance).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genre_change(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            Title.objects.filter(pk=instance.pk).update(
+                updated_at=timezone.now()
+            )
+        return
+    if action == "pre_clear":
+        instance.title.update(updated_at=timezone.now())
+    elif action in ("post_add", "post_remove"):
+        Title.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def touch_user_content(sender, instance, created, **kwargs):
+    loaded_username = getattr(instance, "_loaded_username", None)
+    instance._loaded_username = instance.username
+    if created or loaded_username in (None, instance.username):
+        return
+    Review.objects.filter(author=instance).update(updated_at=timezone.now())
+    Comment.objects.filter(author=instance).update(updated_at=timezone.now())
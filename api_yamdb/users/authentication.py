@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from api_yamdb.replicas import use_primary
+from .tokens import VERSION_CLAIM
+
+
+def user_cache_key(user_id):
+    return f"jwt-user:{user_id}"
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, который берёт пользователя из кеша на
+    JWT_USER_CACHE_TIMEOUT секунд вместо запроса к базе на каждый
+    запрос к API. Запись сбрасывается сигналами из users.signals при
+    любом изменении или удалении пользователя, в том числе роли и
+    is_active.
+
+    Токен принимается, только если его token_version совпадает с
+    пользователем: смена роли увеличивает версию и отзывает все ранее
+    выданные токены (токены без версии считаются версией 0).
+    """
+
+    def get_user(self, validated_token):
+        key = user_cache_key(validated_token.get(api_settings.USER_ID_CLAIM))
+        user = cache.get(key)
+        if user is None:
+            # Пользователь с отстающей реплики попал бы в кеш со старой
+            # ролью и token_version.
+            with use_primary():
+                user = super().get_user(validated_token)
+            cache.set(key, user, settings.JWT_USER_CACHE_TIMEOUT)
+        elif not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        if validated_token.get(VERSION_CLAIM, 0) != user.token_version:
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+        return user
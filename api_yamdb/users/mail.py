@@ -0,0 +1,140 @@
+"""
+Очередь исходящих писем. Реализация выбирается настройкой MAIL_QUEUE:
+
+* outbox - письмо сохраняется в таблицу OutboxEmail, запрос не ждёт
+  SMTP-сервер; письма пачками отправляет команда send_queued_mail,
+  неудачные попытки повторяются с растущей паузой;
+* thread - письмо отправляет пул потоков текущего процесса (для
+  разработки: не нужен отдельный воркер, но письма теряются при
+  перезапуске);
+* sync - письмо отправляется сразу, в потоке запроса.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection, send_mail
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from users.models import OutboxEmail
+
+
+logger = logging.getLogger(__name__)
+
+
+class SyncMailQueue:
+    def enqueue(self, subject, message, from_email, recipient_list):
+        send_mail(
+            subject=subject,
+            message=message,
+            from_email=from_email,
+            recipient_list=recipient_list,
+            fail_silently=True,
+        )
+
+
+class ThreadMailQueue:
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.MAIL_QUEUE_THREADS,
+            thread_name_prefix="mail",
+        )
+
+    def enqueue(self, subject, message, from_email, recipient_list):
+        # Письмо уходит только после фиксации транзакции, в которой
+        # оно создано, например вместе с новым кодом подтверждения.
+        transaction.on_commit(lambda: self.executor.submit(
+            self.send, subject, message, from_email, recipient_list
+        ))
+
+    def send(self, subject, message, from_email, recipient_list):
+        try:
+            send_mail(
+                subject=subject,
+                message=message,
+                from_email=from_email,
+                recipient_list=recipient_list,
+            )
+        except Exception:
+            logger.exception("Не удалось отправить письмо %s", recipient_list)
+
+
+class OutboxMailQueue:
+    def enqueue(self, subject, message, from_email, recipient_list):
+        OutboxEmail.objects.create(
+            subject=subject,
+            body=message,
+            from_email=from_email,
+            recipients=",".join(recipient_list),
+        )
+
+
+MAIL_QUEUES = {
+    "sync": SyncMailQueue,
+    "thread": ThreadMailQueue,
+    "outbox": OutboxMailQueue,
+}
+_queues = {}
+
+
+def get_mail_queue():
+    name = settings.MAIL_QUEUE
+    if name not in _queues:
+        queue_class = MAIL_QUEUES.get(name) or import_string(name)
+        _queues[name] = queue_class()
+    return _queues[name]
+
+
+def queue_mail(subject, message, recipient_list, from_email=None):
+    get_mail_queue().enqueue(
+        subject, message, from_email or settings.DEFAULT_FROM_EMAIL,
+        list(recipient_list),
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.MAIL_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def send_outbox(batch_size=100, max_attempts=None):
+    """
+    Отправляет одну пачку писем из OutboxEmail через одно соединение
+    с почтовым сервером. Письма пачки блокируются (на PostgreSQL - с
+    SKIP LOCKED), поэтому воркеров может быть несколько. Возвращает
+    число отправленных и неотправленных писем.
+    """
+    if max_attempts is None:
+        max_attempts = settings.MAIL_MAX_ATTEMPTS
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                sent_at__isnull=True,
+                send_after__lte=now,
+                attempts__lt=max_attempts,
+            )
+            .order_by("send_after", "id")[:batch_size]
+        )
+        if not emails:
+            return 0, 0
+        sent = failed = 0
+        with get_connection() as connection:
+            for email in emails:
+                email.attempts += 1
+                try:
+                    email.to_message(connection).send()
+                except Exception as error:
+                    email.last_error = str(error)
+                    email.send_after = now + retry_delay(email.attempts)
+                    failed += 1
+                else:
+                    email.sent_at = now
+                    sent += 1
+        OutboxEmail.objects.bulk_update(
+            emails, ("attempts", "last_error", "send_after", "sent_at")
+        )
+    return sent, failed
@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.mail import send_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Отправляет письма из очереди OutboxEmail пачками, "
+        "с повторными попытками для неотправленных"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--max-attempts", type=int, default=settings.MAIL_MAX_ATTEMPTS
+        )
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Не завершаться, а проверять очередь каждые --interval "
+                 "секунд",
+        )
+        parser.add_argument("--interval", type=float, default=5)
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            try:
+                sent, failed = send_outbox(
+                    options["batch_size"], options["max_attempts"]
+                )
+            except Exception as error:
+                # Почтовый сервер недоступен: пачка остаётся в очереди.
+                if not options["loop"]:
+                    raise
+                self.stderr.write(f"Mail server error: {error}")
+                sent = failed = 0
+            total_sent += sent
+            total_failed += failed
+            if sent + failed == options["batch_size"]:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {total_sent} emails, failed {total_failed}"
+            )
+        )
@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
+from django.core.mail import EmailMessage
 from django.db import models
 from django.core.validators import RegexValidator
+from django.utils import timezone
 
 
 ROLE_CHOICES = (
@@ -28,10 +30,6 @@ class User(AbstractUser):
         "биография",
         blank=True,
     )
-    confirmation_code = models.CharField(
-        "Код подтверждения", max_length=36, null=True,
-        blank=False, default="XXXX"
-    )
     role = models.CharField(
         "Роль",
         max_length=25,
@@ -40,6 +38,10 @@ class User(AbstractUser):
         default="user",
         error_messages={"validators": "Вы выбрали несуществующую роль"}
     )
+    token_version = models.PositiveIntegerField(
+        "Версия токенов", default=0,
+        help_text="Увеличивается при смене роли и отзывает выданные токены",
+    )
 
     @property
     def is_admin(self):
@@ -56,3 +58,59 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get("username")
+        instance._loaded_roles = (
+            instance.__dict__.get("role"),
+            instance.__dict__.get("is_superuser"),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        # В токенах записана роль, поэтому её смена отзывает все
+        # выданные пользователю токены.
+        loaded_roles = getattr(self, "_loaded_roles", None)
+        if loaded_roles and loaded_roles != (self.role, self.is_superuser):
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_roles = (self.role, self.is_superuser)
+
+
+class OutboxEmail(models.Model):
+    """Письмо в очереди на отправку, см. users.mail."""
+    subject = models.CharField("Тема", max_length=255)
+    body = models.TextField("Текст")
+    from_email = models.CharField("Отправитель", max_length=254)
+    recipients = models.TextField("Получатели через запятую")
+    created_at = models.DateTimeField("Дата создания", auto_now_add=True)
+    send_after = models.DateTimeField("Отправить после", default=timezone.now)
+    attempts = models.PositiveSmallIntegerField("Попыток", default=0)
+    sent_at = models.DateTimeField("Дата отправки", null=True, blank=True)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+
+    class Meta:
+        verbose_name = "Письмо в очереди"
+        verbose_name_plural = "Очередь писем"
+        indexes = (
+            models.Index(
+                fields=("sent_at", "send_after"), name="outbox_pending_idx"
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipients}"
+
+    def to_message(self, connection=None):
+        return EmailMessage(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.recipients.split(","),
+            connection=connection,
+        )
@@ -0,0 +1,81 @@
+import time
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import base36_to_int, int_to_base36
+from rest_framework_simplejwt.tokens import AccessToken
+
+ROLE_CLAIM = "role"
+SUPERUSER_CLAIM = "is_superuser"
+VERSION_CLAIM = "token_version"
+
+
+class ConfirmationCodeGenerator:
+    """
+    Коды подтверждения без хранения в базе, по образцу
+    PasswordResetTokenGenerator: код - время выпуска и HMAC от него
+    и данных пользователя на SECRET_KEY. Код проверяется пересчётом
+    HMAC и перестаёт действовать через CONFIRMATION_CODE_TIMEOUT
+    секунд, после смены username/email или после выдачи по нему
+    токена: get_jwt_token обновляет last_login, входящий в HMAC.
+    """
+    key_salt = "users.tokens.ConfirmationCodeGenerator"
+
+    def make_code(self, user):
+        return self._make_code_with_timestamp(user, self._now())
+
+    def check_code(self, user, code):
+        if not (user and code):
+            return False
+        try:
+            ts_b36, _ = str(code).split("-")
+            timestamp = base36_to_int(ts_b36)
+        except ValueError:
+            return False
+        if not constant_time_compare(
+            self._make_code_with_timestamp(user, timestamp), code
+        ):
+            return False
+        return (
+            0 <= self._now() - timestamp
+            <= settings.CONFIRMATION_CODE_TIMEOUT
+        )
+
+    def _make_code_with_timestamp(self, user, timestamp):
+        hash_string = salted_hmac(
+            self.key_salt,
+            self._make_hash_value(user, timestamp),
+            algorithm="sha256",
+        ).hexdigest()[::2]
+        return f"{int_to_base36(timestamp)}-{hash_string}"
+
+    def _make_hash_value(self, user, timestamp):
+        # В отличие от PasswordResetTokenGenerator микросекунды не
+        # отбрасываются: иначе код, обменянный на токен, действовал бы
+        # до конца той же секунды.
+        login_timestamp = "" if user.last_login is None else (
+            user.last_login.replace(tzinfo=None)
+        )
+        return (
+            f"{user.pk}{user.username}{user.email}"
+            f"{login_timestamp}{timestamp}"
+        )
+
+    def _now(self):
+        return int(time.time())
+
+
+confirmation_code_generator = ConfirmationCodeGenerator()
+
+
+def access_token_for(user):
+    """
+    Access-токен с ролью пользователя: права можно проверить по токену,
+    не читая пользователя. Токен действует, пока token_version в нём
+    совпадает с пользователем (см. CachedJWTAuthentication).
+    """
+    token = AccessToken.for_user(user)
+    token[ROLE_CLAIM] = user.role
+    token[SUPERUSER_CLAIM] = user.is_superuser
+    token[VERSION_CLAIM] = user.token_version
+    return token
@@ -1,26 +1,27 @@
-import uuid
-
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
-from rest_framework.pagination import (PageNumberPagination)
 from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
 from api_yamdb.settings import EMAIL_NAME
+from api.pagination import CachedCountPagination
 from api.permissions import (
     IsAdminOrSuperuser
 )
+from users.authentication import user_cache_key
+from users.mail import queue_mail
 from users.serializers import (
     UserAdminSerializer,
     UserRegistrationSerializer,
     UserMeSerializer,
     UserTokenSerializer
 )
+from users.tokens import access_token_for, confirmation_code_generator
 
 
 User = get_user_model()
@@ -36,15 +37,13 @@ class UserSignUpViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     permission_classes = (permissions.AllowAny,)
 
     def send_confirmation_code(self, user):
-        confirmation_code = str(uuid.uuid4())
-        user.confirmation_code = confirmation_code
-        user.save()
-        send_mail(
+        # Код не хранится в базе: повторная регистрация ничего не пишет.
+        confirmation_code = confirmation_code_generator.make_code(user)
+        queue_mail(
             subject="Код подтверждения",
             message=f"Ваш код подтверждения: {confirmation_code}",
             recipient_list=(user.email,),
             from_email=EMAIL_NAME,
-            fail_silently=True
         )
 
     def create(self, request):
@@ -82,10 +81,21 @@ def get_jwt_token(request):
         User,
         username=serializer.validated_data["username"]
     )
-    if confirmation_code == user.confirmation_code:
-        token = AccessToken.for_user(user)
+    # Код одноразовый: новый last_login меняет HMAC всех выданных кодов.
+    # Условный UPDATE не даёт двум параллельным запросам обменять
+    # один код дважды.
+    if confirmation_code_generator.check_code(
+        user, confirmation_code
+    ) and User.objects.filter(
+        pk=user.pk, last_login=user.last_login
+    ).update(last_login=timezone.now()):
+        cache.delete(user_cache_key(user.pk))
+        token = access_token_for(user)
         return Response({"token": str(token)}, status=status.HTTP_200_OK)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    return Response(
+        {"confirmation_code": ["Неверный или просроченный код подтверждения"]},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -94,7 +104,7 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAdminOrSuperuser,)
     lookup_field = "username"
     http_method_names = methods + ["head", "options", "trace"]
-    pagination_class = PageNumberPagination
+    pagination_class = CachedCountPagination
     filter_backends = (filters.SearchFilter,)
     filterset_fields = ("username",)
     search_fields = ("username", )
@@ -107,11 +117,15 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer_class=UserMeSerializer,
         url_path="me")
     def get_user_info(self, request):
-        user = get_object_or_404(User, username=self.request.user)
+        user = request.user
         if request.method == "GET":
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         elif request.method == "PATCH":
+            # request.user может быть копией из кеша аутентификации:
+            # save() записал бы её устаревшие поля (last_login,
+            # token_version, роль) поверх текущих.
+            user = User.objects.get(pk=user.pk)
             serializer = self.get_serializer(
                 user, data=request.data, partial=True
             )
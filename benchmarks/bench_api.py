@@ -0,0 +1,353 @@
+"""
+Нагрузочный бенчмарк эндпоинтов /api/v1/ на синтетических данных.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_api.py --titles 5000 --users 2000 \\
+        --requests 200 --output report.json
+
+Бенчмарк создаёт отдельную тестовую базу, наполняет её командой
+generate_data и прогоняет каждый сценарий через тестовый клиент DRF.
+Сценарии покрывают все эндпоинты: чтение, фасеты, создание,
+изменение и удаление, пакетную загрузку отзывов и регистрацию.
+Объекты для удаления и произведения для новых отзывов создаются
+заранее, по одному на каждую итерацию вместе с прогревом.
+Для каждого сценария в отчёт пишутся перцентили задержки p50/p95/p99,
+среднее число SQL-запросов и пропускная способность. Отчёт можно
+сравнить с предыдущим прогоном через --baseline.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api_yamdb"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment,
+)
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from reviews.models import (  # noqa: E402
+    Category, Comment, Genre, Review, Title,
+)
+
+BATCH_SIZE = 5
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+    )
+    return client
+
+
+def make_clients():
+    User = get_user_model()
+    admin = User.objects.create_user(
+        username="bench-admin", email="bench-admin@yamdb.fake", role="admin"
+    )
+    writer = User.objects.create_user(
+        username="bench-writer", email="bench-writer@yamdb.fake"
+    )
+    return APIClient(), client_for(admin), admin, client_for(writer)
+
+
+def create_titles(prefix, count):
+    # В Django 3.2 bulk_create на SQLite не возвращает id, их читаем
+    # по уникальным названиям.
+    names = [f"{prefix} {idx}" for idx in range(count)]
+    Title.objects.bulk_create(Title(name=name, year=2000) for name in names)
+    return list(
+        Title.objects.filter(name__in=names).order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def prepare_targets(admin, review, runs):
+    """
+    Объекты для сценариев записи, по одному на итерацию. Отзывы для
+    удаления создаются через ORM по одному, чтобы сигналы учли их
+    в рейтинге произведений.
+    """
+    User = get_user_model()
+    delete_review_titles = create_titles("С удаляемым отзывом", runs)
+    for title_id in delete_review_titles:
+        Review.objects.create(
+            title_id=title_id, author=admin, text="Отзыв", score=5
+        )
+    comments = [f"Удаляемый комментарий {idx}" for idx in range(runs)]
+    Comment.objects.bulk_create(
+        Comment(review=review, author=admin, text=text) for text in comments
+    )
+    slugs = [f"delete-{idx}" for idx in range(runs)]
+    Category.objects.bulk_create(
+        Category(name=slug, slug=slug) for slug in slugs
+    )
+    Genre.objects.bulk_create(Genre(name=slug, slug=slug) for slug in slugs)
+    usernames = [f"delete{idx}" for idx in range(runs)]
+    User.objects.bulk_create(
+        User(username=username, email=f"{username}@yamdb.fake")
+        for username in usernames
+    )
+    return {
+        "review titles": create_titles("Для отзыва", runs),
+        "batch titles": create_titles("Для пакета", runs * BATCH_SIZE),
+        "titles": create_titles("Удаляемое", runs),
+        "reviews": list(
+            Review.objects.filter(title_id__in=delete_review_titles)
+            .order_by("id").values_list("title_id", "id")
+        ),
+        "comments": list(
+            Comment.objects.filter(text__in=comments).order_by("id")
+            .values_list("id", flat=True)
+        ),
+        "categories": slugs,
+        "genres": slugs,
+        "users": usernames,
+    }
+
+
+def write_scenarios(admin_client, writer_client, reviews, targets, runs):
+    """
+    Создание и удаление. Номер итерации i (отрицательный на прогреве)
+    выбирает свой объект: i % runs не повторяется за весь прогон.
+    """
+    def target(name, i):
+        return targets[name][i % runs]
+
+    def batch(i):
+        titles = targets["batch titles"]
+        start = i % runs * BATCH_SIZE
+        return [
+            {"title_id": title_id, "text": "Пакет", "score": 7}
+            for title_id in titles[start:start + BATCH_SIZE]
+        ]
+
+    return {
+        "POST title": lambda i: admin_client.post("/api/v1/titles/", data={
+            "name": f"Новое {i}", "year": 2000,
+            "genre": ["genre-1"], "category": "category-1",
+        }),
+        "POST category": lambda i: admin_client.post(
+            "/api/v1/categories/",
+            data={"name": f"Новая {i}", "slug": f"new-{i % runs}"},
+        ),
+        "POST genre": lambda i: admin_client.post(
+            "/api/v1/genres/",
+            data={"name": f"Новый {i}", "slug": f"new-{i % runs}"},
+        ),
+        "POST user": lambda i: admin_client.post("/api/v1/users/", data={
+            "username": f"new{i % runs}", "email": f"new{i % runs}@yamdb.fake"
+        }),
+        "POST review": lambda i: admin_client.post(
+            f"/api/v1/titles/{target('review titles', i)}/reviews/",
+            data={"text": "Отзыв", "score": i % 10 + 1},
+        ),
+        "POST reviews/batch": lambda i: writer_client.post(
+            "/api/v1/reviews/batch/", data=batch(i), format="json"
+        ),
+        "POST comment": lambda i: admin_client.post(
+            f"{reviews}/comments/", data={"text": f"bench {i}"}
+        ),
+        "DELETE comment": lambda i: admin_client.delete(
+            f"{reviews}/comments/{target('comments', i)}/"
+        ),
+        "DELETE review": lambda i: admin_client.delete(
+            "/api/v1/titles/{}/reviews/{}/".format(*target("reviews", i))
+        ),
+        "DELETE title": lambda i: admin_client.delete(
+            f"/api/v1/titles/{target('titles', i)}/"
+        ),
+        "DELETE category": lambda i: admin_client.delete(
+            f"/api/v1/categories/{target('categories', i)}/"
+        ),
+        "DELETE genre": lambda i: admin_client.delete(
+            f"/api/v1/genres/{target('genres', i)}/"
+        ),
+        "DELETE user": lambda i: admin_client.delete(
+            f"/api/v1/users/{target('users', i)}/"
+        ),
+    }
+
+
+def build_scenarios(anon, admin_client, admin, writer_client, runs):
+    """
+    Сценарии: имя -> функция, выполняющая один запрос по номеру итерации.
+    Чтение идёт по самому популярному произведению и его первому отзыву.
+    """
+    title = Title.objects.order_by("-rating_count", "id").first()
+    review = Review.objects.filter(title=title).order_by("id").first()
+    comment = Comment.objects.filter(review=review).order_by("id").first()
+    deep_page = max(1, Title.objects.count() // 10)
+    targets = prepare_targets(admin, review, runs)
+    titles = f"/api/v1/titles/{title.id}"
+    reviews = f"{titles}/reviews/{review.id}"
+    scenarios = {
+        "GET titles": lambda i: anon.get("/api/v1/titles/"),
+        "GET titles deep page": lambda i: anon.get(
+            f"/api/v1/titles/?page={deep_page}"
+        ),
+        "GET titles?genre": lambda i: anon.get(
+            "/api/v1/titles/?genre=genre-1"
+        ),
+        "GET titles?name": lambda i: anon.get(
+            "/api/v1/titles/?name=Произведение 1"
+        ),
+        "GET titles/facets": lambda i: anon.get(
+            "/api/v1/titles/facets/?genre=genre-1"
+        ),
+        "GET title": lambda i: anon.get(f"{titles}/"),
+        "GET categories": lambda i: anon.get("/api/v1/categories/"),
+        "GET genres": lambda i: anon.get("/api/v1/genres/"),
+        "GET reviews": lambda i: anon.get(f"{titles}/reviews/"),
+        "GET review": lambda i: anon.get(f"{reviews}/"),
+        "GET comments": lambda i: anon.get(f"{reviews}/comments/"),
+        "GET users": lambda i: admin_client.get("/api/v1/users/"),
+        "GET users/me": lambda i: admin_client.get("/api/v1/users/me/"),
+        "GET user": lambda i: admin_client.get(
+            f"/api/v1/users/{admin.username}/"
+        ),
+        "PATCH review": lambda i: admin_client.patch(
+            f"{reviews}/", data={"score": i % 10 + 1}
+        ),
+        "POST auth/signup": lambda i: anon.post(
+            "/api/v1/auth/signup/",
+            data={"username": f"bench{i}", "email": f"bench{i}@yamdb.fake"},
+        ),
+        "POST auth/token": lambda i: anon.post(
+            "/api/v1/auth/token/",
+            data={"username": admin.username, "confirmation_code": "wrong"},
+        ),
+    }
+    if comment is not None:
+        scenarios["GET comment"] = lambda i: anon.get(
+            f"{reviews}/comments/{comment.id}/"
+        )
+    scenarios.update(write_scenarios(
+        admin_client, writer_client, reviews, targets, runs
+    ))
+    return scenarios
+
+
+def percentile(values, point):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100)[point - 1]
+
+
+def measure(run, requests, warmup):
+    for i in range(warmup):
+        run(-i - 1)
+    latencies = []
+    queries = 0
+    statuses = set()
+    started = time.perf_counter()
+    for i in range(requests):
+        with CaptureQueriesContext(connection) as context:
+            request_started = time.perf_counter()
+            response = run(i)
+            latencies.append((time.perf_counter() - request_started) * 1000)
+        queries += len(context)
+        statuses.add(response.status_code)
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "status_codes": sorted(statuses),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries_per_request": round(queries / requests, 2),
+        "requests_per_second": round(requests / elapsed, 1),
+    }
+
+
+def compare(report, baseline):
+    print(f"{'scenario':<24}{'p95 before':>12}{'p95 after':>12}{'change':>9}")
+    for name, result in report["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            continue
+        change = (result["p95_ms"] / before["p95_ms"] - 1) * 100
+        print(f"{name:<24}{before['p95_ms']:>12.2f}"
+              f"{result['p95_ms']:>12.2f}{change:>8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--titles", type=int, default=1000)
+    parser.add_argument("--genres", type=int, default=30)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--reviews-per-title", type=float, default=20)
+    parser.add_argument("--comments-per-review", type=float, default=2)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--only", nargs="+", metavar="SCENARIO",
+        help="Запустить только указанные сценарии",
+    )
+    parser.add_argument("--output", help="Файл для JSON-отчёта")
+    parser.add_argument("--baseline", help="Отчёт прошлого прогона")
+    args = parser.parse_args()
+
+    dataset = {
+        "users": args.users,
+        "titles": args.titles,
+        "genres": args.genres,
+        "categories": args.categories,
+        "reviews_per_title": args.reviews_per_title,
+        "comments_per_review": args.comments_per_review,
+        "skew": args.skew,
+    }
+    # Ответы 4xx в сценариях ожидаемы, их логирование только мешает.
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        call_command("generate_data", stdout=io.StringIO(), **dataset)
+        scenarios = build_scenarios(
+            *make_clients(), runs=args.requests + args.warmup
+        )
+        results = {}
+        for name, run in scenarios.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = measure(run, args.requests, args.warmup)
+            print(f"{name:<24}{json.dumps(results[name])}")
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+    report = {
+        "vendor": connection.vendor,
+        "dataset": dataset,
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
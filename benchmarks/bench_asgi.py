@@ -0,0 +1,177 @@
+"""
+Пропускная способность чтения под uvicorn: WSGI против ASGI.
+
+Запуск из корня репозитория (нужен пакет uvicorn):
+
+    python benchmarks/bench_asgi.py --titles 500 --concurrency 1 8 32 \\
+        --requests 400 --output asgi.json
+
+Бенчмарк готовит файловую базу SQLite командами migrate и
+generate_data и для каждого режима поднимает uvicorn с одним воркером:
+
+* wsgi - api_yamdb.wsgi через --interface wsgi (пул потоков uvicorn);
+* asgi-sync - api_yamdb.asgi с ASYNC_READ_VIEWS=0: синхронные
+  представления DRF, все в одном потоке sync_to_async;
+* asgi - api_yamdb.asgi с асинхронным путём чтения (api.async_views).
+
+Запросы к отзывам и комментариям первого произведения из списка
+отправляются параллельно с заданным числом одновременных клиентов.
+Для каждого уровня параллельности в отчёт пишутся запросы в секунду,
+p50/p95 задержки и число ошибок.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(BASE_DIR, "api_yamdb")
+
+MODES = {
+    "wsgi": (["api_yamdb.wsgi:application", "--interface", "wsgi"], {}),
+    "asgi-sync": (["api_yamdb.asgi:application"], {"ASYNC_READ_VIEWS": "0"}),
+    "asgi": (["api_yamdb.asgi:application"], {"ASYNC_READ_VIEWS": "1"}),
+}
+
+
+def percentile(values, point):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100)[point - 1]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def manage(env, *args):
+    subprocess.run(
+        [sys.executable, "manage.py", *args], cwd=PROJECT_DIR, env=env,
+        check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+def start_server(mode, env):
+    app, mode_env = MODES[mode]
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", *app,
+            "--port", str(port), "--workers", "1",
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=PROJECT_DIR, env={**env, **mode_env},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{base_url}/api/v1/titles/", timeout=1)
+            return server, base_url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"uvicorn ({mode}) не запустился за 30 секунд")
+
+
+def build_urls(base_url):
+    titles = requests.get(f"{base_url}/api/v1/titles/").json()["results"]
+    title = f"{base_url}/api/v1/titles/{titles[0]['id']}"
+    reviews = requests.get(f"{title}/reviews/").json()["results"]
+    review = f"{title}/reviews/{reviews[0]['id']}"
+    return [f"{title}/reviews/", f"{review}/", f"{review}/comments/"]
+
+
+def load(urls, concurrency, total):
+    sessions = threading.local()
+
+    def fetch(i):
+        if not hasattr(sessions, "session"):
+            sessions.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            ok = sessions.session.get(urls[i % len(urls)]).status_code == 200
+        except requests.RequestException:
+            ok = False
+        return (time.perf_counter() - started) * 1000, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(fetch, range(total)))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for latency, _ in results]
+    return {
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "errors": sum(not ok for _, ok in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=200)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 8, 32]
+    )
+    parser.add_argument(
+        "--requests", type=int, default=300,
+        help="Запросов на каждый уровень параллельности",
+    )
+    parser.add_argument(
+        "--modes", nargs="+", choices=MODES, default=list(MODES),
+        metavar="MODE",
+    )
+    parser.add_argument("--output", help="Файл для JSON-отчёта")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DB_ENGINE": "sqlite",
+            "DB_NAME": os.path.join(tmp, "bench.sqlite3"),
+            "DJANGO_SETTINGS_MODULE": "api_yamdb.settings",
+        }
+        manage(env, "migrate")
+        manage(
+            env, "generate_data",
+            "--titles", str(args.titles), "--users", str(args.users),
+        )
+        results = {}
+        for mode in args.modes:
+            server, base_url = start_server(mode, env)
+            try:
+                urls = build_urls(base_url)
+                load(urls, 1, 10)
+                results[mode] = {}
+                for concurrency in args.concurrency:
+                    result = load(urls, concurrency, args.requests)
+                    results[mode][concurrency] = result
+                    print(f"{mode:<10}{concurrency:>4} {json.dumps(result)}")
+            finally:
+                server.terminate()
+                server.wait()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "titles": args.titles,
+                "requests": args.requests,
+                "modes": results,
+            }, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
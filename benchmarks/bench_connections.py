@@ -0,0 +1,175 @@
+"""
+Бенчмарк накладных расходов на соединение с базой на каждый запрос.
+
+Запуск из корня репозитория (PostgreSQL берётся из переменных
+окружения DB_*, см. settings.py):
+
+    DB_ENGINE=postgresql python benchmarks/bench_connections.py \\
+        --requests 500 --output connections.json
+
+Каждый режим запускается в отдельном процессе со своими настройками:
+
+* per-request - CONN_MAX_AGE=0, новое соединение на каждый запрос;
+* persistent - CONN_MAX_AGE=60, соединение переживает запрос;
+* pool - пул соединений api_yamdb.postgresql_pool (только PostgreSQL).
+
+Тестовый клиент Django не закрывает соединения после ответа, поэтому
+бенчмарк сам вызывает close_old_connections(), как это делает
+обработчик WSGI по сигналу request_finished. В отчёт пишутся
+перцентили задержки запроса, сколько раз открывалось соединение
+(для пула - выдавалось из пула) и сколько времени на это ушло.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api_yamdb"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+
+MODES = {
+    "per-request": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "0"},
+    "persistent": {"DB_CONN_MAX_AGE": "60", "DB_POOL": "0"},
+    "pool": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "1"},
+}
+
+
+def percentile(values, point):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100)[point - 1]
+
+
+def run_worker(requests, warmup):
+    """
+    Прогоняет запросы в текущем процессе и возвращает результаты.
+    """
+    import django
+
+    django.setup()
+
+    from django.db import close_old_connections, connection
+    from django.test.utils import (
+        setup_databases, setup_test_environment, teardown_databases,
+        teardown_test_environment,
+    )
+    from rest_framework.test import APIClient
+
+    from reviews.models import Review, Title
+    from users.models import User
+
+    if connection.vendor == "sqlite":
+        # In-memory база SQLite живёт, пока открыто соединение, и Django
+        # его не закрывает; замер имеет смысл только на файле.
+        test_dir = tempfile.TemporaryDirectory()
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(
+            test_dir.name, "bench.sqlite3"
+        )
+
+    connects = []
+    connect = connection.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        connect()
+        connects.append((time.perf_counter() - started) * 1000)
+
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        title = Title.objects.create(name="Произведение", year=2000)
+        for idx in range(10):
+            author = User.objects.create(
+                username=f"bench{idx}", email=f"bench{idx}@yamdb.fake"
+            )
+            Review.objects.create(
+                title=title, author=author, text="Отзыв", score=idx + 1
+            )
+        url = f"/api/v1/titles/{title.id}/reviews/"
+        client = APIClient()
+        connection.close()
+        connection.connect = timed_connect
+        for _ in range(warmup):
+            client.get(url)
+            close_old_connections()
+        del connects[:]
+        latencies = []
+        statuses = set()
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            statuses.add(client.get(url).status_code)
+            close_old_connections()
+            latencies.append((time.perf_counter() - request_started) * 1000)
+        elapsed = time.perf_counter() - started
+        del connection.connect
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+    return {
+        "vendor": connection.vendor,
+        "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+        "requests": requests,
+        "status_codes": sorted(statuses),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "connects": len(connects),
+        "connect_ms_total": round(sum(connects), 3),
+        "connect_ms_mean": round(statistics.mean(connects), 3)
+        if connects else 0,
+        "requests_per_second": round(requests / elapsed, 1),
+    }
+
+
+def run_mode(mode, args):
+    env = {**os.environ, **MODES[mode]}
+    output = subprocess.run(
+        [
+            sys.executable, os.path.abspath(__file__), "--worker",
+            "--requests", str(args.requests), "--warmup", str(args.warmup),
+        ],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--modes", nargs="+", choices=MODES, metavar="MODE",
+        help="Режимы для замера, по умолчанию все доступные",
+    )
+    parser.add_argument("--output", help="Файл для JSON-отчёта")
+    parser.add_argument(
+        "--worker", action="store_true", help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.requests, args.warmup)))
+        return
+
+    modes = args.modes or [
+        mode for mode in MODES
+        if mode != "pool" or os.getenv("DB_ENGINE", "sqlite") != "sqlite"
+    ]
+    results = {}
+    for mode in modes:
+        results[mode] = run_mode(mode, args)
+        print(f"{mode:<14}{json.dumps(results[mode])}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"modes": results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
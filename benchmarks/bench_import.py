@@ -0,0 +1,106 @@
+"""
+Сравнение способов загрузки import_csv (--engine=orm и --engine=copy)
+на сгенерированном наборе данных.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_import.py --reviews 2000000
+
+Бенчмарк создаёт отдельную тестовую базу (как при запуске тестов),
+поэтому рабочие данные не затрагиваются. Для сравнения с COPY
+DATABASES должен указывать на PostgreSQL.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api_yamdb"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+
+REVIEWS_PER_TITLE = 100
+
+
+def generate_dataset(path, reviews, comments_per_review):
+    """
+    Пишет CSV-файлы командой generate_data: около сотни отзывов
+    на произведение, равномерно. Возвращает общее число строк.
+    """
+    call_command(
+        "generate_data",
+        output=path,
+        titles=max(1, reviews // REVIEWS_PER_TITLE),
+        users=REVIEWS_PER_TITLE,
+        reviews_per_title=REVIEWS_PER_TITLE,
+        comments_per_review=comments_per_review,
+        skew=0,
+        stdout=io.StringIO(),
+    )
+    rows = 0
+    for name in os.listdir(path):
+        with open(os.path.join(path, name), encoding="utf-8") as f:
+            rows += sum(1 for _ in f) - 1
+    return rows
+
+
+def run(engine, path, workers):
+    call_command("flush", interactive=False, verbosity=0)
+    started = time.monotonic()
+    call_command("import_csv", path=path, engine=engine, workers=workers)
+    return time.monotonic() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--comments-per-review", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--engines", nargs="+", default=("orm", "copy"))
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=1, interactive=False)
+    try:
+        with tempfile.TemporaryDirectory() as path:
+            rows = generate_dataset(
+                path, args.reviews, args.comments_per_review
+            )
+            results = {}
+            engines = [
+                engine for engine in args.engines
+                if engine != "copy" or connection.vendor == "postgresql"
+            ]
+            for engine in engines:
+                elapsed = run(engine, path, args.workers)
+                results[engine] = {
+                    "seconds": round(elapsed, 3),
+                    "rows_per_second": round(rows / elapsed),
+                }
+    finally:
+        teardown_databases(old_config, verbosity=1)
+        teardown_test_environment()
+    print(json.dumps({
+        "vendor": connection.vendor,
+        "rows": rows,
+        "workers": args.workers,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Скорость JSON-рендерера и парсера API: DRF (stdlib json) против
+api.renderers.FastJSONRenderer и api.parsers.FastJSONParser (orjson).
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_json.py --titles 2000 --page-size 100 \\
+        --output json.json
+
+Бенчмарк наполняет тестовую базу командой generate_data и берёт
+данные ответов: страницы /titles/ и /reviews/ из API и страницы по
+--page-size объектов TitleReadSerializer и ReviewSerializer. Каждый
+ответ рендерится и разбирается обоими способами; в отчёт пишутся
+размер ответа, мегабайты в секунду и ускорение.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api_yamdb"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.parsers import FastJSONParser  # noqa: E402
+from api.renderers import FastJSONRenderer, orjson  # noqa: E402
+from api.serializers import (  # noqa: E402
+    ReviewSerializer, TitleReadSerializer,
+)
+from reviews.models import Review, Title  # noqa: E402
+
+
+def build_payloads(page_size):
+    client = APIClient()
+    title = Title.objects.order_by("-rating_count", "id").first()
+    titles = (
+        Title.objects.select_related("category")
+        .prefetch_related("genre").order_by("id")[:page_size]
+    )
+    reviews = (
+        Review.objects.select_related("author", "title")
+        .filter(title=title).order_by("-pub_date")[:page_size]
+    )
+    return {
+        "GET titles": client.get("/api/v1/titles/").data,
+        "GET reviews": client.get(f"/api/v1/titles/{title.id}/reviews/").data,
+        f"titles x{page_size}": TitleReadSerializer(titles, many=True).data,
+        f"reviews x{page_size}": ReviewSerializer(reviews, many=True).data,
+    }
+
+
+def throughput(run, size, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        run()
+    elapsed = time.perf_counter() - started
+    return size * iterations / elapsed / 2 ** 20
+
+
+def measure(data, iterations):
+    content = JSONRenderer().render(data)
+    size = len(content)
+    results = {"bytes": size}
+    for name, renderer in (
+        ("drf", JSONRenderer()), ("fast", FastJSONRenderer())
+    ):
+        results[f"render_{name}_mb_s"] = round(throughput(
+            lambda: renderer.render(data), size, iterations
+        ), 1)
+    for name, parser in (("drf", JSONParser()), ("fast", FastJSONParser())):
+        results[f"parse_{name}_mb_s"] = round(throughput(
+            lambda: parser.parse(io.BytesIO(content)), size, iterations
+        ), 1)
+    for kind in ("render", "parse"):
+        results[f"{kind}_speedup"] = round(
+            results[f"{kind}_fast_mb_s"] / results[f"{kind}_drf_mb_s"], 2
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--titles", type=int, default=500)
+    parser.add_argument("--reviews-per-title", type=float, default=20)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="Файл для JSON-отчёта")
+    args = parser.parse_args()
+
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        call_command(
+            "generate_data", stdout=io.StringIO(), users=args.users,
+            titles=args.titles, reviews_per_title=args.reviews_per_title,
+            comments_per_review=0,
+        )
+        payloads = build_payloads(args.page_size)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+    results = {}
+    for name, data in payloads.items():
+        results[name] = measure(data, args.iterations)
+        print(f"{name:<16}{json.dumps(results[name])}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "orjson": orjson.__version__ if orjson else None,
+                "payloads": results,
+            }, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
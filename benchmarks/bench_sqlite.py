@@ -0,0 +1,221 @@
+"""
+Параллельные читатели и писатели отзывов на файловой базе SQLite.
+
+Запуск из корня репозитория:
+
+    python benchmarks/bench_sqlite.py --readers 4 --writers 4 \\
+        --requests 100 --output sqlite.json
+
+Каждый режим запускается в отдельном процессе на новой базе:
+
+* stock - без PRAGMA из settings.SQLITE_PRAGMAS (журнал отката,
+  synchronous=FULL);
+* tuned - с SQLITE_PRAGMAS (WAL, synchronous=NORMAL, busy_timeout...).
+
+Читатели запрашивают список отзывов произведения, писатели создают
+отзывы POST-запросами к ReviewViewSet: все идут по одной серии
+произведений, каждый от своего пользователя, поэтому отзывы не
+повторяются, а записи конкурируют за одни и те же строки. После
+каждого запроса соединение закрывается, как в обработчике WSGI.
+В отчёт пишутся пропускная способность, p95 задержки и число ошибок
+(ответы 5xx и исключения, например "database is locked").
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api_yamdb"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import (  # noqa: E402
+    close_old_connections, connection, connections,
+)
+from django.test.utils import (  # noqa: E402
+    setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient  # noqa: E402
+
+from reviews.models import Title  # noqa: E402
+from users.models import User  # noqa: E402
+from users.tokens import access_token_for  # noqa: E402
+
+MODES = ("stock", "tuned")
+
+
+def percentile(values, point):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100)[point - 1]
+
+
+def send(client, kind, title_id, url, i):
+    try:
+        if kind == "write":
+            return client.post(
+                f"/api/v1/titles/{title_id}/reviews/",
+                data={"text": "Отзыв", "score": i % 10 + 1},
+            ).status_code
+        return client.get(url).status_code
+    except Exception:
+        return None
+
+
+def run_client(kind, token, titles, url, barrier, requests):
+    """Поток читателя или писателя: задержки и число ошибок."""
+    client = APIClient()
+    if token:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    expected = 201 if kind == "write" else 200
+    latencies = []
+    errors = 0
+    barrier.wait()
+    try:
+        for i in range(requests):
+            started = time.perf_counter()
+            status = send(client, kind, titles[i], url, i)
+            close_old_connections()
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += status != expected
+    finally:
+        connections.close_all()
+    return kind, latencies, errors
+
+
+def create_data(titles, writers):
+    """Произведения и токены писателей; режим журнала новой базы."""
+    title_ids = [
+        Title.objects.create(name=f"Произведение {idx}", year=2000).id
+        for idx in range(titles)
+    ]
+    tokens = [
+        str(access_token_for(User.objects.create(
+            username=f"writer{idx}", email=f"writer{idx}@yamdb.fake"
+        )))
+        for idx in range(writers)
+    ]
+    journal_mode = connection.cursor().execute(
+        "PRAGMA journal_mode"
+    ).fetchone()[0]
+    connection.close()
+    return title_ids, tokens, journal_mode
+
+
+def run_clients(readers, tokens, titles, requests):
+    url = f"/api/v1/titles/{titles[0]}/reviews/"
+    barrier = threading.Barrier(readers + len(tokens))
+    jobs = [("read", None)] * readers + [
+        ("write", token) for token in tokens
+    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(len(jobs)) as executor:
+        results = list(executor.map(
+            lambda job: run_client(*job, titles, url, barrier, requests),
+            jobs,
+        ))
+    return results, time.perf_counter() - started
+
+
+def build_report(journal_mode, results, elapsed):
+    report = {"journal_mode": journal_mode, "errors": 0}
+    for kind in ("read", "write"):
+        latencies = [
+            latency for job_kind, job_latencies, _ in results
+            if job_kind == kind for latency in job_latencies
+        ]
+        report["errors"] += sum(
+            errors for job_kind, _, errors in results if job_kind == kind
+        )
+        if latencies:
+            report[f"{kind}s_per_second"] = round(len(latencies) / elapsed, 1)
+            report[f"{kind}_p95_ms"] = round(percentile(latencies, 95), 3)
+    return report
+
+
+def run_worker(mode, readers, writers, requests):
+    """
+    Прогоняет нагрузку в текущем процессе и возвращает результаты.
+    """
+    if mode == "stock":
+        settings.SQLITE_PRAGMAS = {}
+    test_dir = tempfile.TemporaryDirectory()
+    connection.settings_dict["TEST"]["NAME"] = os.path.join(
+        test_dir.name, "bench.sqlite3"
+    )
+    # Ошибки блокировок ожидаемы в режиме stock, их трейсбеки не нужны.
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        titles, tokens, journal_mode = create_data(requests, writers)
+        results, elapsed = run_clients(readers, tokens, titles, requests)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+        test_dir.cleanup()
+    return build_report(journal_mode, results, elapsed)
+
+
+def run_mode(mode, args):
+    output = subprocess.run(
+        [
+            sys.executable, os.path.abspath(__file__), "--worker", mode,
+            "--readers", str(args.readers), "--writers", str(args.writers),
+            "--requests", str(args.requests),
+        ],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument(
+        "--requests", type=int, default=100,
+        help="Запросов на каждый поток",
+    )
+    parser.add_argument(
+        "--modes", nargs="+", choices=MODES, default=MODES, metavar="MODE",
+    )
+    parser.add_argument("--output", help="Файл для JSON-отчёта")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(
+            args.worker, args.readers, args.writers, args.requests
+        )))
+        return
+
+    results = {}
+    for mode in args.modes:
+        results[mode] = run_mode(mode, args)
+        print(f"{mode:<8}{json.dumps(results[mode])}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "readers": args.readers,
+                "writers": args.writers,
+                "requests": args.requests,
+                "modes": results,
+            }, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
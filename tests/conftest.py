@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,33 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    # TEST_DB_FILE - файловая тестовая база SQLite вместо общей in-memory:
+    # на ней параллельные записи ждут блокировку (busy_timeout), а не
+    # падают сразу с "table is locked".
+    test_db_file = os.getenv('TEST_DB_FILE')
+    if test_db_file:
+        from django.conf import settings
+
+        settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = (
+            test_db_file
+        )
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def sync_mail_queue(settings):
+    # Как и locmem-бэкенд почты, тесты видят письма в mail.outbox сразу;
+    # очереди проверяются отдельно, в test_21_mail_queue.
+    settings.MAIL_QUEUE = 'sync'
@@ -0,0 +1,126 @@
+import pytest
+
+from tests.utils import assert_max_queries
+
+
+# Допустимое число SQL-запросов на одну страницу ответа. Бюджет не
+# должен зависеть от количества объектов на странице.
+QUERY_BUDGETS = {
+    '/api/v1/titles/': 3,
+    '/api/v1/titles/{title_id}/': 2,
+    '/api/v1/categories/': 2,
+    '/api/v1/genres/': 2,
+    '/api/v1/titles/{title_id}/reviews/': 3,
+    '/api/v1/titles/{title_id}/reviews/{review_id}/': 1,
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/': 3,
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/': 1,
+    '/api/v1/users/': 3,
+    '/api/v1/users/me/': 1,
+}
+# Бюджеты POST-запросов: пользователь, родительский объект, BEGIN,
+# INSERT и обновление рейтинга для отзыва. Повторный отзыв отсекает
+# уникальное ограничение, без отдельного запроса exists().
+WRITE_QUERY_BUDGETS = {
+    '/api/v1/titles/{title_id}/reviews/': 5,
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/': 3,
+}
+
+
+@pytest.fixture
+def catalog(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    categories = [
+        Category.objects.create(name=f'Категория {idx}', slug=f'cat-{idx}')
+        for idx in range(3)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(4)
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        for idx in range(10)
+    ]
+    titles = []
+    for idx in range(10):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000 + idx,
+            category=categories[idx % len(categories)]
+        )
+        title.genre.set(genres[:idx % len(genres) + 1])
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=7
+        )
+        for author in authors
+    ]
+    for author in authors:
+        Comment.objects.create(
+            review=reviews[0], author=author, text='Комментарий'
+        )
+    return titles[0], reviews[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/titles/',
+        '/api/v1/titles/{title_id}/',
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+        '/api/v1/titles/{title_id}/reviews/',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/',
+    ))
+    def test_01_public_endpoints(self, client, catalog, url):
+        title, review = catalog
+        path = url.format(
+            title_id=title.id, review_id=review.id,
+            comment_id=review.comments.first().id,
+        )
+        with assert_max_queries(url, QUERY_BUDGETS[url]):
+            response = client.get(path)
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('url', ('/api/v1/users/', '/api/v1/users/me/'))
+    def test_02_user_endpoints(self, admin_client, catalog, url):
+        with assert_max_queries(url, QUERY_BUDGETS[url]):
+            response = admin_client.get(url)
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('url', tuple(WRITE_QUERY_BUDGETS))
+    def test_03_create_endpoints(self, user_client, catalog, url):
+        title, review = catalog
+        path = url.format(title_id=title.id, review_id=review.id)
+        with assert_max_queries(url, WRITE_QUERY_BUDGETS[url]):
+            response = user_client.post(
+                path, data={'text': 'Текст', 'score': 5}
+            )
+        assert response.status_code == 201
+
+    def test_04_parent_from_other_title(self, client, user_client,
+                                        catalog):
+        from reviews.models import Title
+
+        title, review = catalog
+        other = Title.objects.exclude(pk=title.pk).first()
+        comment = review.comments.first()
+        urls = (
+            f'/api/v1/titles/{other.id}/reviews/{review.id}/',
+            f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/',
+            f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+            f'{comment.id}/',
+        )
+        for url in urls:
+            assert client.get(url).status_code == 404, (
+                f'Проверьте, что GET-запрос к `{url}` для отзыва другого '
+                'произведения возвращает ответ со статусом 404.'
+            )
+        response = user_client.post(urls[1], data={'text': 'Текст'})
+        assert response.status_code == 404
@@ -0,0 +1,163 @@
+import csv
+import os
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(file_name):
+    with open(os.path.join(DATA_PATH, file_name), encoding='utf-8') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ImportCsv:
+
+    def test_01_import_all(self):
+        from reviews.models import Comment, Review, Title, User
+
+        call_command('import_csv', '--batch-size', '7', path=DATA_PATH)
+
+        assert Title.objects.count() == count_rows('titles.csv')
+        assert User.objects.count() == count_rows('users.csv')
+        assert Review.objects.count() == count_rows('review.csv')
+        assert Comment.objects.count() == count_rows('comments.csv')
+        assert Title.genre.through.objects.count() == count_rows(
+            'genre_title.csv'
+        ), (
+            'Проверьте, что `genre_title.csv` загружается в связь '
+            '`Title.genre`.'
+        )
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year < 2023, (
+            'Проверьте, что `import_csv` сохраняет даты публикации из CSV.'
+        )
+        title = review.title
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после импорта отзывов пересчитывается рейтинг '
+            'произведений.'
+        )
+
+        call_command('import_csv', path=DATA_PATH)
+        assert Review.objects.count() == count_rows('review.csv'), (
+            'Проверьте, что повторный запуск `import_csv` не создаёт '
+            'дубликатов.'
+        )
+
+    def test_02_import_only(self):
+        from reviews.models import Category, Genre, Title
+
+        call_command('import_csv', '--only', 'genre', 'category',
+                     path=DATA_PATH)
+
+        assert Category.objects.count() == count_rows('category.csv')
+        assert Genre.objects.count() == count_rows('genre.csv')
+        assert not Title.objects.exists()
+
+        with pytest.raises(CommandError):
+            call_command('import_csv', '--only', 'unknown', path=DATA_PATH)
+
+    def test_03_dependency_graph(self):
+        from reviews.management.commands.import_csv import (
+            build_dependencies, csv_files
+        )
+
+        dependencies = build_dependencies(list(csv_files))
+        assert dependencies['category.csv'] == set()
+        assert dependencies['genre.csv'] == set()
+        assert dependencies['users.csv'] == set()
+        assert dependencies['titles.csv'] == {'category.csv'}
+        assert dependencies['genre_title.csv'] == {'genre.csv', 'titles.csv'}
+        assert dependencies['review.csv'] == {'titles.csv', 'users.csv'}
+        assert dependencies['comments.csv'] == {'review.csv', 'users.csv'}
+
+        dependencies = build_dependencies(['review.csv', 'comments.csv'])
+        assert dependencies['review.csv'] == set(), (
+            'Проверьте, что зависимости от файлов, не выбранных через '
+            '`--only`, не учитываются.'
+        )
+
+    def test_04_parallel_import_order(self, monkeypatch):
+        import threading
+
+        from reviews.management.commands import import_csv
+
+        lock = threading.Lock()
+        finished = []
+
+        def fake_import(engine, file_path, model, columns, batch_size):
+            with lock:
+                finished.append(os.path.basename(file_path))
+            return 0, 0.0
+
+        monkeypatch.setattr(
+            import_csv, 'supports_parallel_import', lambda: True
+        )
+        monkeypatch.setattr(import_csv, 'timed_import', fake_import)
+        call_command('import_csv', '--workers', '3', path=DATA_PATH)
+
+        assert sorted(finished) == sorted(import_csv.csv_files)
+        dependencies = import_csv.build_dependencies(finished)
+        for position, name in enumerate(finished):
+            assert dependencies[name] <= set(finished[:position]), (
+                f'Файл `{name}` загружен раньше файлов, от которых зависит.'
+            )
+
+    def test_05_copy_engine_falls_back_on_sqlite(self):
+        from io import StringIO
+
+        from reviews.models import Genre
+
+        out = StringIO()
+        call_command('import_csv', '--engine', 'copy', '--only', 'genre',
+                     path=DATA_PATH, stdout=out)
+        assert Genre.objects.count() == count_rows('genre.csv')
+        assert 'ORM' in out.getvalue()
+
+    def test_06_import_invalidates_caches(self, client):
+        from reviews.models import Title
+
+        facets = client.get('/api/v1/titles/facets/').json()
+        assert facets['count'] == 0
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        assert client.get('/api/v1/genres/').json()['count'] == 0
+
+        call_command('import_csv', '--only', 'category', 'genre', 'titles',
+                     'genre_title', path=DATA_PATH)
+        titles = count_rows('titles.csv')
+        facets = client.get('/api/v1/titles/facets/').json()
+        assert facets['count'] == titles, (
+            'Проверьте, что после `import_csv` индекс фасетов строится '
+            'заново.'
+        )
+        assert facets['genre'], (
+            'Проверьте, что после `import_csv` фасеты учитывают жанры.'
+        )
+        assert client.get('/api/v1/titles/').json()['count'] == titles, (
+            'Проверьте, что после `import_csv` сбрасываются кешированные '
+            'число объектов и ответы списков.'
+        )
+        assert client.get('/api/v1/genres/').json()['count'] == (
+            count_rows('genre.csv')
+        )
+        title = Title.objects.order_by('id').first()
+        assert client.get(f'/api/v1/titles/{title.id}/').json()[
+            'rating'
+        ] is None
+
+        call_command('import_csv', '--only', 'users', 'review',
+                     path=DATA_PATH)
+        title.refresh_from_db()
+        assert title.rating is not None
+        assert client.get(f'/api/v1/titles/{title.id}/').json()[
+            'rating'
+        ] == title.rating, (
+            'Проверьте, что после импорта отзывов карточка произведения '
+            'отдаёт пересчитанный рейтинг.'
+        )
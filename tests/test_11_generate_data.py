@@ -0,0 +1,69 @@
+import random
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11GenerateData:
+
+    def test_01_generate_and_load(self):
+        from reviews.models import Comment, Genre, Review, Title, User
+
+        call_command(
+            'generate_data', '--users', '20', '--titles', '30',
+            '--genres', '5', '--reviews-per-title', '4',
+            '--comments-per-review', '1.5', stdout=StringIO()
+        )
+
+        assert User.objects.count() == 20
+        assert Title.objects.count() == 30
+        assert Genre.objects.count() == 5
+        assert Review.objects.count() == 120
+        assert Comment.objects.count() == 180
+        assert sum(
+            Title.objects.values_list('rating_count', flat=True)
+        ) == 120, (
+            'Проверьте, что после генерации данных пересчитан рейтинг '
+            'произведений.'
+        )
+
+    def test_02_generate_csv_only(self, tmp_path):
+        from reviews.models import Title
+
+        call_command('generate_data', '--titles', '5', '--users', '5',
+                     output=str(tmp_path), stdout=StringIO())
+
+        assert (tmp_path / 'review.csv').exists()
+        assert not Title.objects.exists(), (
+            'Проверьте, что с параметром `--output` данные только '
+            'записываются в CSV-файлы.'
+        )
+
+    def test_03_genre_filter(self, client):
+        from reviews.models import Title
+
+        call_command('generate_data', '--titles', '20', '--genres', '3',
+                     stdout=StringIO())
+
+        expected = Title.objects.filter(genre__slug='genre-1').count()
+        assert expected > 0
+        response = client.get('/api/v1/titles/?genre=genre-1')
+        assert response.json()['count'] == expected, (
+            'Проверьте, что сгенерированные жанры произведений видны '
+            'фильтру `genre` API.'
+        )
+
+
+def test_zipf_counts():
+    from reviews.management.commands.generate_data import zipf_counts
+
+    rng = random.Random(0)
+    uniform = zipf_counts(100, 10, 0, 100, rng)
+    assert uniform == [10] * 10
+
+    skewed = zipf_counts(1000, 50, 1.2, 60, rng)
+    assert sum(skewed) == 1000
+    assert max(skewed) == 60
+    assert min(skewed) < 10
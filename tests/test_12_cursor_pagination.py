@@ -0,0 +1,125 @@
+import base64
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tests.utils import assert_max_queries
+
+
+@pytest.fixture
+def review_with_comments(admin, user):
+    from reviews.models import Comment, Review, Title
+
+    title = Title.objects.create(name='Произведение', year=2000)
+    review = Review.objects.create(
+        title=title, author=user, text='Отзыв', score=5
+    )
+    for idx in range(25):
+        Comment.objects.create(
+            review=review, author=admin, text=f'Комментарий {idx}'
+        )
+    # Часть комментариев с одинаковой датой: порядок внутри группы
+    # должен определяться id.
+    Comment.objects.filter(pk__in=Comment.objects.order_by('id')[5:15]
+                           .values('pk')).update(pub_date=timezone.now())
+    return title, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CursorPagination:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_comments_cursor_walk(self, client, review_with_comments):
+        from reviews.models import Comment
+
+        title, review = review_with_comments
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        ) + '?cursor='
+        seen = []
+        while url:
+            with assert_max_queries(url, 2):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсорной пагинации не '
+                'выполняется подсчёт количества объектов.'
+            )
+            seen.extend(comment['id'] for comment in data['results'])
+            url = data['next']
+
+        expected = list(
+            Comment.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        assert seen == expected, (
+            'Проверьте, что курсорная пагинация комментариев отдаёт каждый '
+            'комментарий ровно один раз в порядке (pub_date, id).'
+        )
+
+    def test_02_page_number_is_default(self, client, review_with_comments):
+        title, review = review_with_comments
+        response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        ))
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 25
+
+    def test_03_reviews_cursor(self, client, review_with_comments):
+        title, review = review_with_comments
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor='
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item['id'] for item in data['results']] == [review.id]
+        assert data['next'] is None
+
+    def test_04_keyset_without_offset(self, client, review_with_comments):
+        from reviews.models import Comment
+
+        title, review = review_with_comments
+        Comment.objects.update(pub_date=timezone.now())
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        ) + '?cursor='
+        pages = []
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                data = client.get(url).json()
+                pages.append([comment['id'] for comment in data['results']])
+                previous, url = data['previous'], data['next']
+            backwards = []
+            while previous:
+                data = client.get(previous).json()
+                backwards.insert(0, [item['id'] for item in data['results']])
+                previous = data['previous']
+        assert not any(
+            'OFFSET' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что курсор хранит ключ (pub_date, id) и страницы '
+            'с одинаковыми датами выбираются без OFFSET.'
+        )
+        expected = list(
+            Comment.objects.order_by('-id').values_list('id', flat=True)
+        )
+        assert sum(pages, []) == expected
+        assert backwards == pages[:-1]
+
+        base_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        )
+        for position in ('2024-01-01', '["2024-01-01", "x"]'):
+            cursor = base64.b64encode(
+                urlencode({'p': position}).encode()
+            ).decode()
+            response = client.get(base_url, {'cursor': cursor})
+            assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    count_sql = [
+        query for query in context.captured_queries
+        if 'COUNT(' in query['sql'].upper()
+    ]
+    return response.json()['count'], len(count_sql)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13CachedCount:
+
+    def test_01_count_is_cached(self, client, admin_client):
+        create_titles(admin_client)
+
+        assert count_queries(client, '/api/v1/titles/') == (2, 1)
+        assert count_queries(client, '/api/v1/titles/') == (2, 0), (
+            'Проверьте, что повторный запрос списка произведений берёт '
+            'количество объектов из кеша.'
+        )
+        assert count_queries(
+            client, '/api/v1/titles/?genre=horror'
+        ) == (1, 1), (
+            'Проверьте, что количество кешируется отдельно для каждого '
+            'набора фильтров.'
+        )
+        assert count_queries(client, '/api/v1/titles/?page=1') == (2, 0)
+
+    def test_02_count_invalidated_on_write(self, client, admin_client):
+        from reviews.models import Genre, Title
+
+        titles, _, _ = create_titles(admin_client)
+        assert count_queries(client, '/api/v1/titles/?genre=horror')[0] == 1
+        assert count_queries(client, '/api/v1/categories/')[0] == 2
+
+        Title.objects.get(pk=titles[1]['id']).genre.add(
+            Genre.objects.get(slug='horror')
+        )
+        assert count_queries(
+            client, '/api/v1/titles/?genre=horror'
+        ) == (2, 1), (
+            'Проверьте, что кешированное количество сбрасывается при '
+            'изменении жанров произведения.'
+        )
+
+        response = admin_client.delete('/api/v1/categories/books/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert count_queries(client, '/api/v1/categories/') == (1, 1)
+
+        response = admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert count_queries(client, '/api/v1/titles/')[0] == 1
+
+    def test_03_estimated_count(self, client, admin_client, monkeypatch):
+        from api import pagination
+
+        create_titles(admin_client)
+        monkeypatch.setattr(
+            pagination.CachedCountPagination, 'estimate_count_over', 100
+        )
+        monkeypatch.setattr(pagination, 'estimate_count', lambda qs: 5000)
+        assert count_queries(client, '/api/v1/titles/') == (5000, 0), (
+            'Проверьте, что для списка без фильтров используется оценка '
+            'числа строк, если она больше порога.'
+        )
+        assert count_queries(client, '/api/v1/titles/?year=1984') == (1, 1)
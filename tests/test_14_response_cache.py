@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import assert_max_queries, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ResponseCache:
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_anonymous_reads_are_cached(self, client, admin_client):
+        create_titles(admin_client)
+        for url in ('/api/v1/titles/', '/api/v1/titles/?year=1984',
+                    '/api/v1/categories/', '/api/v1/genres/'):
+            first = self.get(client, url)
+            assert first['X-Cache'] == 'MISS'
+            with assert_max_queries(url, 0):
+                second = self.get(client, url)
+            assert second['X-Cache'] == 'HIT', (
+                f'Проверьте, что повторный анонимный GET-запрос к `{url}` '
+                'отдаётся из кеша.'
+            )
+            assert second.json() == first.json()
+
+        response = admin_client.get('/api/v1/titles/')
+        assert 'X-Cache' not in response, (
+            'Проверьте, что запросы авторизованных пользователей '
+            'не кешируются.'
+        )
+
+    def test_02_invalidation(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        first_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        second_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        for url in (first_url, second_url, '/api/v1/titles/'):
+            self.get(client, url)
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        response = self.get(client, first_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 9, (
+            'Проверьте, что кеш произведения сбрасывается при добавлении '
+            'отзыва.'
+        )
+        assert self.get(client, '/api/v1/titles/')['X-Cache'] == 'MISS'
+        assert self.get(client, second_url)['X-Cache'] == 'HIT', (
+            'Проверьте, что отзыв сбрасывает кеш только своего произведения.'
+        )
+
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.get(slug=titles[1]['category'])
+        category.name = 'Новое имя'
+        category.save()
+        response = self.get(client, second_url)
+        assert response.json()['category']['name'] == 'Новое имя'
+
+        Title.objects.get(pk=titles[1]['id']).genre.add(
+            Genre.objects.get(slug='horror')
+        )
+        response = self.get(client, second_url)
+        assert 'horror' in [genre['slug'] for genre in
+                            response.json()['genre']]
+
+        self.get(client, '/api/v1/genres/')
+        response = admin_client.delete('/api/v1/genres/horror/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        slugs = [genre['slug'] for genre in
+                 self.get(client, '/api/v1/genres/').json()['results']]
+        assert 'horror' not in slugs
+
+    def test_03_stats(self, client, admin_client, user_client):
+        self.get(client, '/api/v1/categories/')
+        self.get(client, '/api/v1/categories/')
+
+        response = admin_client.get('/api/v1/cache/stats/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['categories'] == {'hits': 1, 'misses': 1}
+
+        response = user_client.get('/api/v1/cache/stats/')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_versions_bumped_after_commit(self, user):
+        from django.db import transaction
+
+        from api.cache import RESPONSE_NAMESPACE, get_versions, version_key
+        from api.facets import FACET_NAMESPACE
+        from api.pagination import COUNT_NAMESPACE
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        keys = [
+            version_key(RESPONSE_NAMESPACE, Title),
+            version_key(RESPONSE_NAMESPACE, Title, title.id),
+            version_key(COUNT_NAMESPACE, Title),
+            version_key(FACET_NAMESPACE, Title),
+        ]
+        before = get_versions(keys)
+        with transaction.atomic():
+            title.name = 'Новое название'
+            title.save()
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=5
+            )
+            assert get_versions(keys) == before, (
+                'Проверьте, что версии кеша увеличиваются после фиксации '
+                'транзакции: иначе параллельный запрос закеширует старые '
+                'данные под новой версией.'
+            )
+        after = get_versions(keys)
+        assert all(
+            new > old for (_, old), (_, new) in zip(before, after)
+        )
@@ -0,0 +1,151 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    assert_max_queries, create_comments, create_single_review, create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    def check_not_modified(self, client, url, max_queries, **headers):
+        with assert_max_queries(url, max_queries):
+            response = client.get(url, **headers)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что условный GET-запрос к `{url}` для неизменённого '
+            'ресурса возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        return response
+
+    def test_01_title(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+
+        # Авторизация + лёгкий запрос валидатора, без сериализации.
+        self.check_not_modified(user_client, url, 2, HTTP_IF_NONE_MATCH=etag)
+        self.check_not_modified(
+            user_client, url, 2, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        # Анонимный запрос после первого промаха берёт валидатор
+        # из кеша ответов.
+        self.check_not_modified(client, url, 1, HTTP_IF_NONE_MATCH=etag)
+        client.get(url)
+        self.check_not_modified(client, url, 0, HTTP_IF_NONE_MATCH=etag)
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва ETag произведения '
+            'меняется.'
+        )
+        assert response['ETag'] != etag
+
+        from reviews.models import Category
+
+        etag = response['ETag']
+        category = Category.objects.get(slug=titles[0]['category'])
+        category.name = 'Кино'
+        category.save()
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение категории меняет ETag произведения.'
+        )
+
+    def test_02_title_list(self, admin_client, user_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        etag = user_client.get(url)['ETag']
+        self.check_not_modified(user_client, url, 3, HTTP_IF_NONE_MATCH=etag)
+
+        response = user_client.get(url + '?year=1984',
+                                   HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_reviews_and_comments(self, admin_client, admin, user_client,
+                                     user, moderator_client, moderator):
+        authors = {
+            admin: admin_client, user: user_client, moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, authors)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review_url = f'{reviews_url}{reviews[0]["id"]}/'
+        comments_url = f'{review_url}comments/'
+
+        etags = {}
+        for url in (reviews_url, review_url, comments_url):
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert 'updated_at' not in str(response.json()), (
+                'Проверьте, что поле `updated_at` не попадает в ответы API.'
+            )
+            etags[url] = response['ETag']
+            self.check_not_modified(
+                user_client, url, 4, HTTP_IF_NONE_MATCH=etags[url]
+            )
+
+        response = admin_client.patch(review_url, data={'text': 'Новый'})
+        assert response.status_code == HTTPStatus.OK
+        for url in (reviews_url, review_url):
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что изменение отзыва меняет ETag `{url}`.'
+            )
+        self.check_not_modified(
+            user_client, comments_url, 4,
+            HTTP_IF_NONE_MATCH=etags[comments_url]
+        )
+
+        moderator.username = 'RenamedModerator'
+        moderator.save()
+        response = user_client.get(
+            comments_url, HTTP_IF_NONE_MATCH=etags[comments_url]
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена username автора меняет ETag комментариев.'
+        )
+
+    def test_04_list_paginated_once(self, admin, user_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=5
+        )
+        for idx in range(15):
+            Comment.objects.create(
+                review=review, author=admin, text=f'Комментарий {idx}'
+            )
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+        assert response.status_code == HTTPStatus.OK
+        comment_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_comment"' in query['sql']
+        ]
+        assert len(comment_queries) == 2, (
+            'Проверьте, что при несовпавшем ETag список не считает COUNT '
+            'и не выбирает страницу повторно.\n' + '\n'.join(comment_queries)
+        )
+
+        cursor_url = f'{url}?cursor='
+        response = user_client.get(cursor_url, HTTP_IF_NONE_MATCH='"stale"')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['next'], (
+            'Проверьте, что курсорная лента с условными заголовками '
+            'отдаёт ссылку на следующую страницу.'
+        )
+        self.check_not_modified(
+            user_client, cursor_url, 4, HTTP_IF_NONE_MATCH=response['ETag']
+        )
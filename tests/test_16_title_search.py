@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleSearch:
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        Category.objects.create(name='Фильмы ужасов', slug='films-horror')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Мелодрама', slug='melodrama')
+        first = Title.objects.create(
+            name='Крёстный отец', year=1972, category=category,
+            description='Сага о семье Корлеоне',
+        )
+        first.genre.set([genre])
+        second = Title.objects.create(
+            name='Отец невесты', year=1991,
+            description='Комедия о свадьбе',
+        )
+        third = Title.objects.create(
+            name='Побег из Шоушенка', year=1994,
+            description='Экранизация Кинга, где отец даже не упоминается',
+        )
+        return first, second, third
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranked(self, client, titles):
+        found = self.search(client, 'отец')
+        assert set(found[:2]) == {'Крёстный отец', 'Отец невесты'}, (
+            'Проверьте, что `?search=` ищет без учёта регистра, а совпадения '
+            'в названии идут выше совпадений в описании.'
+        )
+        assert found[2:] == ['Побег из Шоушенка'], (
+            'Проверьте, что `?search=` ищет и по описанию произведения.'
+        )
+        assert self.search(client, 'семье корлеоне') == ['Крёстный отец']
+        assert self.search(client, 'шоуш') == ['Побег из Шоушенка'], (
+            'Проверьте, что последнее слово запроса ищется как префикс.'
+        )
+        assert self.search(client, 'отец свадьба') == []
+        assert self.search(client, '"OR* (') == []
+
+    def test_02_index_follows_writes(self, client, titles):
+        from reviews.models import Title
+
+        first, second, _ = titles
+        first.name = 'Крёстная мать'
+        first.save()
+        second.delete()
+        Title.objects.bulk_create([
+            Title(name='Отец солдата', year=1964),
+        ])
+        assert self.search(client, 'отец') == [
+            'Отец солдата', 'Побег из Шоушенка'
+        ], (
+            'Проверьте, что поисковый индекс обновляется при создании, '
+            'изменении и удалении произведений.'
+        )
+        assert self.search(client, 'мать') == ['Крёстная мать']
+
+    def test_03_exact_slug_filters(self, client, titles):
+        response = client.get(self.TITLES_URL, {'category': 'films'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что фильтр `category` сравнивает слаг целиком.'
+        )
+        response = client.get(self.TITLES_URL, {'genre': 'drama'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что фильтр `genre` сравнивает слаг целиком.'
+        )
+        response = client.get(self.TITLES_URL, {'genre': 'dram'})
+        assert response.json()['count'] == 0
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleFilters:
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Genre, Title
+
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        Category.objects.create(name='Музыка', slug='music')
+        drama, comedy, horror = (
+            Genre.objects.create(name=name, slug=slug)
+            for name, slug in (
+                ('Драма', 'drama'), ('Комедия', 'comedy'), ('Ужасы', 'horror')
+            )
+        )
+        titles = {}
+        for name, category, genres in (
+            ('Драма', films, [drama]),
+            ('Трагикомедия', films, [drama, comedy]),
+            ('Комедия', books, [comedy]),
+            ('Хоррор', books, [horror]),
+        ):
+            titles[name] = Title.objects.create(
+                name=name, year=2000, category=category
+            )
+            titles[name].genre.set(genres)
+        return titles
+
+    def names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        names = [title['name'] for title in data['results']]
+        assert data['count'] == len(names)
+        return sorted(names)
+
+    def test_01_genre_any(self, client, titles):
+        assert self.names(client, {'genre': 'drama,comedy'}) == [
+            'Драма', 'Комедия', 'Трагикомедия'
+        ], (
+            'Проверьте, что `?genre=a,b` возвращает произведения хотя бы с '
+            'одним из жанров и без повторов.'
+        )
+        assert self.names(
+            client, {'genre': 'drama,comedy', 'genre_mode': 'any'}
+        ) == ['Драма', 'Комедия', 'Трагикомедия']
+
+    def test_02_genre_all(self, client, titles):
+        assert self.names(
+            client, {'genre': 'drama,comedy', 'genre_mode': 'all'}
+        ) == ['Трагикомедия'], (
+            'Проверьте, что `?genre=a,b&genre_mode=all` возвращает '
+            'произведения со всеми перечисленными жанрами.'
+        )
+        assert self.names(
+            client, {'genre': 'drama,drama', 'genre_mode': 'all'}
+        ) == ['Драма', 'Трагикомедия']
+        assert self.names(
+            client, {'genre': 'drama,unknown', 'genre_mode': 'all'}
+        ) == []
+
+    def test_03_category_list(self, client, titles):
+        assert self.names(client, {'category': 'films,music'}) == [
+            'Драма', 'Трагикомедия'
+        ]
+        assert self.names(
+            client, {'category': 'books', 'genre': 'comedy,horror'}
+        ) == ['Комедия', 'Хоррор']
+
+    def test_04_invalid_mode(self, client, titles):
+        response = client.get(
+            self.TITLES_URL, {'genre': 'drama', 'genre_mode': 'some'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_single_query_without_distinct(self, client, titles):
+        with CaptureQueriesContext(connection) as context:
+            client.get(
+                self.TITLES_URL, {'genre': 'drama,comedy', 'genre_mode': 'all'}
+            )
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if 'reviews_title_genre' in query['sql']
+        ]
+        assert selects and all(
+            'DISTINCT' not in sql.upper() for sql in selects
+        ), 'Проверьте, что фильтр по жанрам не использует DISTINCT.'
@@ -0,0 +1,145 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import assert_max_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Facets:
+    FACETS_URL = '/api/v1/titles/facets/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Genre, Title
+
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        drama, comedy = (
+            Genre.objects.create(name=name, slug=slug)
+            for name, slug in (('Драма', 'drama'), ('Комедия', 'comedy'))
+        )
+        titles = []
+        for name, year, category, genres in (
+            ('Драма', 1990, films, [drama]),
+            ('Трагикомедия', 1990, films, [drama, comedy]),
+            ('Комедия', 2000, books, [comedy]),
+            ('Без жанра', 2000, None, []),
+        ):
+            title = Title.objects.create(
+                name=name, year=year, category=category
+            )
+            title.genre.set(genres)
+            titles.append(title)
+        return titles
+
+    def get_facets(self, client, params=None):
+        response = client.get(self.FACETS_URL, params or {})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{self.FACETS_URL}` доступен всем.'
+        )
+        data = response.json()
+        return {
+            'count': data['count'],
+            'genre': {item['slug']: item['count'] for item in data['genre']},
+            'category': {
+                item['slug']: item['count'] for item in data['category']
+            },
+            'year': {item['year']: item['count'] for item in data['year']},
+        }
+
+    def test_01_without_filters(self, client, titles):
+        assert self.get_facets(client) == {
+            'count': 4,
+            'genre': {'drama': 2, 'comedy': 2},
+            'category': {'films': 2, 'books': 1},
+            'year': {1990: 2, 2000: 2},
+        }
+
+    def test_02_filters(self, client, titles):
+        facets = self.get_facets(client, {'genre': 'comedy'})
+        assert facets == {
+            'count': 2,
+            # Фасет жанров не учитывает собственный фильтр.
+            'genre': {'drama': 2, 'comedy': 2},
+            'category': {'films': 1, 'books': 1},
+            'year': {1990: 1, 2000: 1},
+        }, (
+            'Проверьте, что счётчики фасетов учитывают фильтры по '
+            'остальным фасетам.'
+        )
+        facets = self.get_facets(
+            client,
+            {'genre': 'drama,comedy', 'genre_mode': 'all', 'year': 1990},
+        )
+        assert facets['count'] == 1
+        assert facets['category'] == {'films': 1}
+        facets = self.get_facets(client, {'category': 'books,films'})
+        assert facets['count'] == 3
+        assert facets['year'] == {1990: 2, 2000: 1}
+        facets = self.get_facets(client, {'name': 'Траги'})
+        assert facets['count'] == 1
+        assert facets['genre'] == {'drama': 1, 'comedy': 1}
+
+    def test_03_index_follows_writes(self, client, titles):
+        from reviews.models import Genre
+
+        self.get_facets(client)
+        with assert_max_queries(self.FACETS_URL, 0):
+            self.get_facets(client, {'genre': 'drama'})
+
+        titles[3].genre.add(Genre.objects.get(slug='drama'))
+        titles[0].delete()
+        facets = self.get_facets(client)
+        assert facets['genre'] == {'drama': 2, 'comedy': 2}, (
+            'Проверьте, что индекс фасетов обновляется при изменении '
+            'жанров и удалении произведений.'
+        )
+        assert facets['count'] == 3
+
+    def test_04_invalid_filter(self, client, titles):
+        response = client.get(self.FACETS_URL, {'genre_mode': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_build_time(self):
+        import time
+
+        from django.db import connection, transaction
+        from django.utils import timezone
+
+        from api.facets import FacetIndex, mask_of, popcount
+        from reviews.models import Category, Genre, Title
+
+        size = 10 ** 5
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        # Разреженные id: маски длиной в миллион битов, как после
+        # удаления части произведений. Строки вставляются в обход ORM,
+        # иначе bulk_create занимает большую часть теста.
+        ids = range(10, 10 * size + 1, 10)
+        now = timezone.now()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {Title._meta.db_table} (id, name, year, '
+                'description, category_id, rating_sum, rating_count, '
+                'updated_at) VALUES (%s, %s, %s, %s, %s, 0, 0, %s)',
+                [(pk, f'Произведение {pk}', 2000 + pk % 20, '',
+                  category.id, now) for pk in ids],
+            )
+            cursor.executemany(
+                f'INSERT INTO {Title.genre.through._meta.db_table} '
+                '(title_id, genre_id) VALUES (%s, %s)',
+                [(pk, genre.id) for pk in ids],
+            )
+
+        started = time.perf_counter()
+        index = FacetIndex.build()
+        elapsed = time.perf_counter() - started
+        assert popcount(index.titles) == size
+        assert index.genres[genre.id] == index.titles
+        assert index.categories[category.id] == mask_of(ids)
+        assert sum(map(popcount, index.years.values())) == size
+        assert elapsed < 1, (
+            'Проверьте, что индекс фасетов строится за линейное время: '
+            f'{size} произведений обработаны за {elapsed:.2f} с.'
+        )
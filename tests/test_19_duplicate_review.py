@@ -0,0 +1,126 @@
+import os
+import subprocess
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.conftest import BASE_DIR
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19DuplicateReview:
+    PARALLEL_REQUESTS = 8
+
+    @pytest.fixture
+    def title(self):
+        from reviews.models import Title
+
+        return Title.objects.create(name='Произведение', year=2000)
+
+    def test_01_no_exists_probe(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Да', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            'SELECT (1) AS "a" FROM "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что создание отзыва не проверяет дубликат '
+            'отдельным запросом, а полагается на уникальное ограничение.'
+        )
+
+        response = user_client.post(url, data={'text': 'Нет', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставили отзыв']
+        }
+
+    def test_02_duplicate_between_check_and_insert(self, monkeypatch,
+                                                   user, user_client, title):
+        from api.serializers import ReviewSerializer
+        from reviews.models import Review, Title
+
+        create = ReviewSerializer.create
+
+        def create_after_competitor(serializer, validated_data):
+            # Параллельный запрос успевает создать отзыв после валидации.
+            Review.objects.create(
+                title=title, author=user, text='Первый', score=10
+            )
+            return create(serializer, validated_data)
+
+        monkeypatch.setattr(
+            ReviewSerializer, 'create', create_after_competitor
+        )
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Второй', 'score': 1},
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что отзыв, созданный параллельным запросом после '
+            'валидации, приводит к ответу со статусом 400, а не 500.'
+        )
+        title = Title.objects.get(pk=title.pk)
+        assert (title.rating_count, title.rating_sum) == (1, 10)
+
+    def run_on_file_db(self, tmp_path, test_name):
+        # Общая in-memory база SQLite не ждёт блокировок: параллельная
+        # запись сразу падает с "table is locked". Тест повторяется в
+        # отдельном процессе на файловой базе с busy_timeout.
+        result = subprocess.run(
+            [
+                sys.executable, '-m', 'pytest', '-q', '-p', 'no:warnings',
+                f'{__file__}::{type(self).__name__}::{test_name}',
+            ],
+            cwd=BASE_DIR, capture_output=True, text=True,
+            env={**os.environ, 'TEST_DB_FILE': str(tmp_path / 'db.sqlite3')},
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+
+    def test_03_parallel_duplicates(self, tmp_path, token_user, title):
+        from reviews.models import Review, Title
+
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.run_on_file_db(tmp_path, 'test_03_parallel_duplicates')
+            return
+
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        barrier = threading.Barrier(self.PARALLEL_REQUESTS)
+
+        def post(score):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+            )
+            try:
+                barrier.wait()
+                return client.post(
+                    url, data={'text': 'Отзыв', 'score': score}
+                ).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(self.PARALLEL_REQUESTS) as executor:
+            statuses = Counter(executor.map(
+                post, range(1, self.PARALLEL_REQUESTS + 1)
+            ))
+        assert statuses == {
+            HTTPStatus.CREATED: 1,
+            HTTPStatus.BAD_REQUEST: self.PARALLEL_REQUESTS - 1,
+        }, (
+            'Проверьте, что при одновременных запросах создаётся ровно '
+            'один отзыв, а остальные получают ответ со статусом 400.'
+        )
+        review = Review.objects.get(title=title)
+        title = Title.objects.get(pk=title.pk)
+        assert (title.rating_count, title.rating_sum) == (1, review.score), (
+            'Проверьте, что отклонённые отзывы не меняют рейтинг.'
+        )
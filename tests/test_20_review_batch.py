@@ -0,0 +1,112 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import assert_max_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ReviewBatch:
+    BATCH_URL = '/api/v1/reviews/batch/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Title
+
+        return [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(3)
+        ]
+
+    def test_01_auth_required(self, client, titles):
+        response = client.post(
+            self.BATCH_URL,
+            data=json.dumps(
+                [{'title_id': titles[0].id, 'text': 'Да', 'score': 5}]
+            ),
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_02_create_all(self, user, user_client, titles):
+        from reviews.models import Review, Title
+
+        items = [
+            {'title_id': title.id, 'text': f'Отзыв {idx}', 'score': idx + 5}
+            for idx, title in enumerate(titles)
+        ]
+        # Авторизация, произведения, уже оставленные отзывы, BEGIN,
+        # INSERT, id отзывов и по UPDATE рейтинга на произведение.
+        with assert_max_queries(self.BATCH_URL, 6 + len(titles)):
+            response = user_client.post(
+                self.BATCH_URL, data=items, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.BATCH_URL}` с корректными '
+            'отзывами возвращает ответ со статусом 201.'
+        )
+        data = response.json()
+        assert data['created'] == len(titles)
+        reviews = Review.objects.filter(author=user)
+        assert {
+            (result['index'], result['id'], result['title_id'])
+            for result in data['results']
+        } == {
+            (idx, review.id, review.title_id)
+            for idx, review in enumerate(reviews.order_by('title_id'))
+        }
+        ratings = Title.objects.order_by('id').values_list(
+            'rating', 'rating_count'
+        )
+        assert list(ratings) == [(5.0, 1), (6.0, 1), (7.0, 1)], (
+            'Проверьте, что пакетная загрузка обновляет рейтинг произведений.'
+        )
+
+    def test_03_partial_results(self, user, user_client, titles):
+        from reviews.models import Review, Title
+
+        Review.objects.create(
+            title=titles[1], author=user, text='Раньше', score=10
+        )
+        items = [
+            {'title_id': titles[0].id, 'text': 'Да', 'score': 8},
+            {'title_id': titles[0].id, 'text': 'Ещё раз', 'score': 1},
+            {'title_id': titles[1].id, 'text': 'Повтор', 'score': 1},
+            {'title_id': titles[2].id, 'text': 'Мимо', 'score': 11},
+            {'title_id': 10 ** 6, 'text': 'Нет', 'score': 5},
+            {'text': 'Без произведения', 'score': 5},
+        ]
+        response = user_client.post(self.BATCH_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            'Проверьте, что при частичной загрузке возвращается ответ со '
+            'статусом 207 и результатом по каждому элементу.'
+        )
+        data = response.json()
+        assert data['created'] == 1
+        results = data['results']
+        assert [result['index'] for result in results] == list(range(6))
+        assert 'id' in results[0]
+        assert results[1]['errors'] == {
+            'non_field_errors': ['Вы уже оставили отзыв']
+        }
+        assert results[2]['errors'] == results[1]['errors']
+        assert set(results[3]['errors']) == {'score'}
+        assert set(results[4]['errors']) == {'title_id'}
+        assert set(results[5]['errors']) == {'title_id'}
+        title = Title.objects.get(pk=titles[0].pk)
+        assert (title.rating_count, title.rating) == (1, 8.0)
+
+    @pytest.mark.parametrize('data', ([], {'title_id': 1}, 'отзыв'))
+    def test_04_invalid_payload(self, user_client, data):
+        response = user_client.post(self.BATCH_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_max_size(self, user_client, titles, settings):
+        settings.REVIEW_BATCH_MAX_SIZE = 2
+        items = [
+            {'title_id': title.id, 'text': 'Да', 'score': 5}
+            for title in titles
+        ]
+        response = user_client.post(self.BATCH_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
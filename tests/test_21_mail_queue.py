@@ -0,0 +1,115 @@
+import io
+import time
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class FailingBackend:
+    """Почтовый бэкенд, который не может отправить ни одного письма."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21MailQueue:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx=0):
+        response = client.post(self.URL_SIGNUP, data={
+            'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'
+        })
+        assert response.status_code == 200
+
+    def test_01_signup_queues_mail(self, client, settings):
+        from users.models import OutboxEmail
+
+        settings.MAIL_QUEUE = 'outbox'
+        outbox_before_count = len(mail.outbox)
+        self.signup(client)
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что при MAIL_QUEUE=outbox регистрация не отправляет '
+            'письмо в запросе, а ставит его в очередь.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipients == 'user0@yamdb.fake'
+        assert email.sent_at is None
+
+        call_command('send_queued_mail', stdout=io.StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == ['user0@yamdb.fake']
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 1
+
+        call_command('send_queued_mail', stdout=io.StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_batches(self, client, settings):
+        from users.mail import send_outbox
+
+        settings.MAIL_QUEUE = 'outbox'
+        for idx in range(5):
+            self.signup(client, idx)
+        outbox_before_count = len(mail.outbox)
+        assert send_outbox(batch_size=2) == (2, 0)
+        assert len(mail.outbox) == outbox_before_count + 2
+        call_command(
+            'send_queued_mail', batch_size=2, stdout=io.StringIO()
+        )
+        assert len(mail.outbox) == outbox_before_count + 5
+
+    def test_03_retries(self, client, settings):
+        from users.mail import send_outbox
+        from users.models import OutboxEmail
+
+        settings.MAIL_QUEUE = 'outbox'
+        settings.MAIL_MAX_ATTEMPTS = 2
+        self.signup(client)
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        assert send_outbox() == (0, 1)
+        email = OutboxEmail.objects.get()
+        assert email.attempts == 1 and email.sent_at is None
+        assert 'SMTP' in email.last_error
+        assert email.send_after > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается на паузу '
+            'перед повторной попыткой.'
+        )
+        assert send_outbox() == (0, 0)
+
+        OutboxEmail.objects.update(send_after=timezone.now())
+        assert send_outbox() == (0, 1)
+        OutboxEmail.objects.update(
+            send_after=timezone.now() - timedelta(days=1)
+        )
+        assert send_outbox() == (0, 0), (
+            'Проверьте, что после MAIL_MAX_ATTEMPTS попыток письмо больше '
+            'не отправляется.'
+        )
+
+    def test_04_thread_queue(self, client, settings):
+        settings.MAIL_QUEUE = 'thread'
+        outbox_before_count = len(mail.outbox)
+        self.signup(client)
+        deadline = time.monotonic() + 5
+        while (len(mail.outbox) == outbox_before_count
+               and time.monotonic() < deadline):
+            time.sleep(0.01)
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что при MAIL_QUEUE=thread письмо отправляет '
+            'пул потоков.'
+        )
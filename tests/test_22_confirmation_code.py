@@ -0,0 +1,128 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ConfirmationCode:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    DATA = {'username': 'newuser', 'email': 'newuser@yamdb.fake'}
+
+    def signup(self, client):
+        response = client.post(self.URL_SIGNUP, data=self.DATA)
+        assert response.status_code == HTTPStatus.OK
+        return re.search(r'\S+$', mail.outbox[-1].body).group()
+
+    def get_token(self, client, code):
+        return client.post(self.URL_TOKEN, data={
+            'username': self.DATA['username'], 'confirmation_code': code
+        })
+
+    def test_01_code_from_mail(self, client):
+        code = self.signup(client)
+        response = self.get_token(client, code)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что код из письма позволяет получить токен.'
+        )
+        assert 'token' in response.json()
+        for wrong in (code[:-1] + ('0' if code[-1] != '0' else '1'),
+                      'abc', '1-2-3', ''):
+            response = self.get_token(client, wrong)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_repeated_signup_writes_nothing(self, client,
+                                               django_user_model):
+        from users.tokens import confirmation_code_generator
+
+        first = self.signup(client)
+        with CaptureQueriesContext(connection) as context:
+            second = self.signup(client)
+        assert not [
+            query for query in context.captured_queries
+            if query['sql'].startswith(('UPDATE', 'INSERT'))
+        ], (
+            'Проверьте, что повторный запрос кода для существующего '
+            'пользователя не пишет в базу.'
+        )
+        user = django_user_model.objects.get(username=self.DATA['username'])
+        for code in (first, second):
+            assert confirmation_code_generator.check_code(user, code)
+        assert self.get_token(client, second).status_code == HTTPStatus.OK
+
+    def test_03_code_expires(self, client, monkeypatch, settings):
+        from users.tokens import ConfirmationCodeGenerator
+
+        code = self.signup(client)
+        now = ConfirmationCodeGenerator._now
+        monkeypatch.setattr(
+            ConfirmationCodeGenerator, '_now',
+            lambda self: now(self) + settings.CONFIRMATION_CODE_TIMEOUT + 1
+        )
+        assert self.get_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что код подтверждения перестаёт действовать.'
+
+    def test_04_code_bound_to_user(self, client, django_user_model):
+        code = self.signup(client)
+        django_user_model.objects.create_user(
+            username='other', email='other@yamdb.fake'
+        )
+        response = client.post(self.URL_TOKEN, data={
+            'username': 'other', 'confirmation_code': code
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        django_user_model.objects.filter(
+            username=self.DATA['username']
+        ).update(email='changed@yamdb.fake')
+        assert self.get_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что код перестаёт действовать после смены email.'
+
+    def test_05_code_is_single_use(self, client):
+        first = self.signup(client)
+        second = self.signup(client)
+        assert self.get_token(client, first).status_code == HTTPStatus.OK
+        for code in (first, second):
+            assert self.get_token(client, code).status_code == (
+                HTTPStatus.BAD_REQUEST
+            ), (
+                'Проверьте, что после выдачи токена код подтверждения и '
+                'другие ранее выданные коды перестают действовать.'
+            )
+        code = self.signup(client)
+        assert self.get_token(client, code).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый код после входа действует.'
+        )
+
+    def test_06_reuse_within_same_second(self, client, monkeypatch):
+        import datetime
+        from types import SimpleNamespace
+
+        from django.utils import timezone
+
+        from users import views
+
+        moments = iter(
+            datetime.datetime(2024, 1, 1, 12, 0, 0, microsecond,
+                              tzinfo=timezone.utc)
+            for microsecond in range(1000, 100000, 1000)
+        )
+        monkeypatch.setattr(
+            views, 'timezone', SimpleNamespace(now=lambda: next(moments))
+        )
+        assert self.get_token(client, self.signup(client)).status_code == (
+            HTTPStatus.OK
+        )
+        code = self.signup(client)
+        assert self.get_token(client, code).status_code == HTTPStatus.OK
+        assert self.get_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), (
+            'Проверьте, что код нельзя обменять на токен повторно даже в '
+            'ту же секунду.'
+        )
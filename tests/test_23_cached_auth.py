@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from tests.utils import assert_max_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23CachedAuth:
+    ME_URL = '/api/v1/users/me/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_user_from_cache(self, user_client):
+        assert user_client.get(self.ME_URL).status_code == HTTPStatus.OK
+        with assert_max_queries(self.ME_URL, 0):
+            response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что повторный запрос с тем же токеном берёт '
+            'пользователя из кеша, без запроса к базе.'
+        )
+
+    def test_02_role_change(self, user, user_client, admin_client):
+        assert user_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что смена роли сбрасывает пользователя в кеше '
+            'аутентификации и отзывает выданные ему токены.'
+        )
+
+    def test_03_deactivated_and_deleted(self, user, user_client):
+        assert user_client.get(self.ME_URL).status_code == HTTPStatus.OK
+        user.is_active = False
+        user.save()
+        assert user_client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что неактивный пользователь не проходит аутентификацию.'
+        user.is_active = True
+        user.save()
+        assert user_client.get(self.ME_URL).status_code == HTTPStatus.OK
+        user.delete()
+        assert user_client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_04_profile_update(self, user_client):
+        user_client.get(self.ME_URL)
+        response = user_client.patch(self.ME_URL, data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(self.ME_URL).json()['bio'] == 'Новое'
+
+    def test_05_profile_update_keeps_fresh_columns(self, user, user_client):
+        user_client.get(self.ME_URL)
+        last_login = timezone.now()
+        type(user).objects.filter(pk=user.pk).update(
+            last_login=last_login, first_name='Из базы'
+        )
+        response = user_client.patch(self.ME_URL, data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.bio == 'Новое'
+        assert (user.last_login, user.first_name) == (last_login, 'Из базы'), (
+            'Проверьте, что PATCH `/users/me/` не записывает поверх базы '
+            'устаревшие поля пользователя из кеша аутентификации.'
+        )
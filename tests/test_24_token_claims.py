@@ -0,0 +1,75 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.utils import assert_max_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TokenClaims:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    USERS_URL = '/api/v1/users/'
+
+    def login(self, user):
+        """Токен через /auth/token/, как его получает клиент."""
+        client = APIClient()
+        client.post(
+            self.URL_SIGNUP,
+            data={'username': user.username, 'email': user.email},
+        )
+        code = re.search(r'\S+$', mail.outbox[-1].body).group()
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username, 'confirmation_code': code
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = response.json()['token']
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client, AccessToken(token)
+
+    def test_01_claims(self, admin):
+        _, token = self.login(admin)
+        assert token['role'] == 'admin', (
+            f'Проверьте, что токен от `{self.URL_TOKEN}` содержит роль '
+            'пользователя.'
+        )
+        assert token['is_superuser'] is False
+        assert token['token_version'] == 0
+
+    def test_02_permissions_from_claims(self, admin):
+        client, _ = self.login(admin)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+        # Пользователь в кеше, права - по токену: без запросов
+        # о пользователе, только список и его количество.
+        with assert_max_queries(self.USERS_URL, 2):
+            response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_role_change_revokes_tokens(self, user, admin_client):
+        client, _ = self.login(user)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(self.USERS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что смена роли отзывает выданные токены.'
+
+        user.refresh_from_db()
+        assert user.token_version == 1
+        client, token = self.login(user)
+        assert token['role'] == 'admin'
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+    def test_04_other_changes_keep_tokens(self, user):
+        client, _ = self.login(user)
+        user.bio = 'Новая биография'
+        user.save()
+        user.refresh_from_db()
+        assert user.token_version == 0
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
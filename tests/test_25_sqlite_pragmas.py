@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.db import connection, connections
+
+from tests.conftest import BASE_DIR
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='PRAGMA применяются только к SQLite'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SqlitePragmas:
+
+    @pytest.fixture
+    def file_connection(self, tmp_path):
+        settings_dict = {
+            **connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')
+        }
+        wrapper = type(connections['default'])(
+            settings_dict, alias='pragmas'
+        )
+        yield wrapper
+        wrapper.close()
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_01_pragmas_applied(self, file_connection):
+        assert self.pragma(file_connection, 'journal_mode') == 'wal', (
+            'Проверьте, что новое соединение с SQLite включает режим WAL.'
+        )
+        assert self.pragma(file_connection, 'synchronous') == 1
+        assert self.pragma(file_connection, 'busy_timeout') == 5000
+        assert self.pragma(file_connection, 'cache_size') == -32 * 1024
+
+    def test_02_pragmas_from_settings(self, file_connection, settings):
+        settings.SQLITE_PRAGMAS = {'busy_timeout': 1234}
+        assert self.pragma(file_connection, 'busy_timeout') == 1234
+        assert self.pragma(file_connection, 'journal_mode') == 'delete'
+
+    def test_03_persistent_pragmas_once(self, file_connection):
+        assert self.pragma(file_connection, 'journal_mode') == 'wal'
+        wrapper = type(file_connection)(
+            file_connection.settings_dict, alias='pragmas_again'
+        )
+        wrapper.force_debug_cursor = True
+        try:
+            wrapper.ensure_connection()
+            executed = [query['sql'] for query in wrapper.queries]
+            assert self.pragma(wrapper, 'journal_mode') == 'wal'
+        finally:
+            wrapper.close()
+        assert 'PRAGMA busy_timeout = 5000' in executed
+        assert not any('journal_mode' in sql for sql in executed), (
+            'Проверьте, что PRAGMA journal_mode, которая сохраняется в '
+            'файле базы, выполняется для базы только один раз.'
+        )
+
+    def test_04_parallel_readers_and_writers(self, tmp_path):
+        report_path = tmp_path / 'report.json'
+        subprocess.run(
+            [
+                sys.executable,
+                os.path.join(BASE_DIR, 'benchmarks', 'bench_sqlite.py'),
+                '--modes', 'tuned', '--readers', '3', '--writers', '3',
+                '--requests', '10', '--output', str(report_path),
+            ],
+            check=True, capture_output=True,
+        )
+        result = json.loads(report_path.read_text())['modes']['tuned']
+        assert result['journal_mode'] == 'wal'
+        assert result['errors'] == 0, (
+            'Проверьте, что параллельные чтения и создание отзывов на '
+            'файловой базе SQLite проходят без ошибок блокировки.'
+        )
+        assert result['reads_per_second'] > 0
+        assert result['writes_per_second'] > 0
@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Реплика в тестах - второй файл SQLite',
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ReadReplicas:
+    """
+    Реплика - отдельный файл SQLite без репликации: данные, созданные
+    только в default, на ней не видны, как на отстающей реплике.
+    """
+    ALIAS = 'replica'
+
+    @pytest.fixture
+    def replica(self, settings, tmp_path):
+        connections.settings[self.ALIAS] = {
+            **connections.settings['default'],
+            'NAME': str(tmp_path / 'replica.sqlite3'),
+        }
+        try:
+            call_command(
+                'migrate', database=self.ALIAS, verbosity=0,
+                interactive=False,
+            )
+            settings.DATABASE_REPLICAS = [self.ALIAS]
+            yield connections[self.ALIAS]
+        finally:
+            connections[self.ALIAS].close()
+            del connections[self.ALIAS]
+            del connections.settings[self.ALIAS]
+
+    @pytest.fixture
+    def title(self, replica):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        Title.objects.using(self.ALIAS).create(
+            id=title.id, name=title.name, year=title.year
+        )
+        return title
+
+    def test_01_reads_from_replica(self, client, replica):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Только в default', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with CaptureQueriesContext(replica) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что GET-запросы читают данные с реплики.'
+        )
+        assert len(context) > 0
+
+    def test_02_writes_to_primary(self, user_client, replica, title):
+        from reviews.models import Review
+
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 7},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Review.objects.filter(title=title).count() == 1
+        assert not Review.objects.using(self.ALIAS).exists()
+
+        # Изменяющий запрос и читает с основной базы.
+        response = user_client.patch(
+            f'/api/v1/titles/{title.id}/reviews/{response.json()["id"]}/',
+            data={'score': 8},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_sticky_after_write(self, client, user, user_client, title):
+        from django.core.cache import cache
+
+        from api_yamdb.replicas import sticky_key
+
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = user_client.get(url)
+        assert response.json()['results'], (
+            'Проверьте, что после записи пользователь какое-то время читает '
+            'с основной базы и видит свой отзыв.'
+        )
+        assert client.get(url).json()['results'] == [], (
+            'Проверьте, что остальные пользователи читают с реплики.'
+        )
+
+        cache.delete(sticky_key(user.id))
+        assert user_client.get(url).json()['results'] == [], (
+            'Проверьте, что по истечении REPLICA_STICKY_TIMEOUT пользователь '
+            'снова читает с реплики.'
+        )
+
+    def test_04_no_replicas(self, client, settings):
+        from reviews.models import Title
+
+        settings.DATABASE_REPLICAS = []
+        title = Title.objects.create(name='Произведение', year=2000)
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_05_caches_filled_from_primary(self, client, user_client, replica):
+        from reviews.models import Title
+
+        Title.objects.create(name='Только в default', year=2000)
+        for _ in range(2):
+            response = client.get('/api/v1/titles/')
+            assert len(response.json()['results']) == 1, (
+                'Проверьте, что кеш ответов заполняется по основной базе: '
+                'реплика могла ещё не получить запись, которая увеличила '
+                'версии кеша.'
+            )
+        assert response['X-Cache'] == 'HIT'
+
+        response = user_client.get('/api/v1/titles/', {'year': 2000})
+        assert response.json()['results'] == []
+        assert response.json()['count'] == 1, (
+            'Проверьте, что кешируемое число объектов пагинации считается '
+            'по основной базе.'
+        )
+
+        response = user_client.get('/api/v1/titles/facets/')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что индекс фасетов строится по основной базе.'
+        )
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import threading
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27AsyncViews:
+    PARALLEL_REQUESTS = 10
+
+    @pytest.fixture
+    def review(self, user):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        Comment.objects.create(review=review, author=user, text='Коммент')
+        return review
+
+    def get(self, url, **extra):
+        async def request():
+            return await AsyncClient().get(url, **extra)
+
+        return async_to_sync(request)()
+
+    def test_01_read_views_are_async(self, review):
+        titles = f'/api/v1/titles/{review.title_id}'
+        reviews = f'{titles}/reviews/{review.id}'
+        for url in (
+            '/api/v1/titles/', f'{titles}/', f'{titles}/reviews/',
+            f'{reviews}/', f'{reviews}/comments/',
+        ):
+            match = resolve(url, urlconf='api_yamdb.async_urls')
+            assert asyncio.iscoroutinefunction(match.func), (
+                f'Проверьте, что под ASGI `{url}` обслуживает асинхронное '
+                'представление.'
+            )
+            assert not asyncio.iscoroutinefunction(resolve(url).func)
+        assert not asyncio.iscoroutinefunction(
+            resolve('/api/v1/users/', urlconf='api_yamdb.async_urls').func
+        )
+
+    def test_02_same_responses(self, client, user_client, token_user, review):
+        titles = f'/api/v1/titles/{review.title_id}'
+        reviews = f'{titles}/reviews/{review.id}'
+        auth = {'authorization': f'Bearer {token_user["access"]}'}
+        for url in (
+            '/api/v1/titles/', f'{titles}/', f'{titles}/reviews/',
+            f'{reviews}/', f'{reviews}/comments/',
+        ):
+            response = self.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == client.get(url).json(), (
+                f'Проверьте, что асинхронный `{url}` отвечает так же, '
+                'как синхронный.'
+            )
+            response = self.get(url, **auth)
+            assert response.json() == user_client.get(url).json()
+
+    def test_03_runs_in_read_pool(self, monkeypatch, review):
+        from api.views import ReviewViewSet
+
+        threads = []
+        list_reviews = ReviewViewSet.list
+
+        def list_and_record(viewset, request, *args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return list_reviews(viewset, request, *args, **kwargs)
+
+        monkeypatch.setattr(ReviewViewSet, 'list', list_and_record)
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+
+        async def parallel():
+            client = AsyncClient()
+            return await asyncio.gather(*(
+                client.get(url) for _ in range(self.PARALLEL_REQUESTS)
+            ))
+
+        responses = async_to_sync(parallel)()
+        assert all(
+            response.status_code == HTTPStatus.OK for response in responses
+        )
+        assert len(threads) == self.PARALLEL_REQUESTS
+        assert all(name.startswith('read') for name in threads), (
+            'Проверьте, что чтение под ASGI выполняется в пуле потоков '
+            'ASYNC_READ_THREADS, а не в общем потоке синхронного кода.'
+        )
+
+    def test_04_auth_and_writes(self, token_user, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+        response = self.get(url, authorization='Bearer invalid')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что асинхронное чтение проверяет токен.'
+        )
+
+        async def patch(data, **extra):
+            return await AsyncClient().patch(
+                url, data=json.dumps(data),
+                content_type='application/json', **extra
+            )
+
+        response = async_to_sync(patch)({'score': 9})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = async_to_sync(patch)(
+            {'score': 9}, authorization=f'Bearer {token_user["access"]}'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get(url).json()['score'] == 9
+
+    def test_05_disabled(self, settings, review):
+        settings.ASYNC_READ_VIEWS = False
+        response = self.get(f'/api/v1/titles/{review.title_id}/reviews/')
+        assert response.status_code == HTTPStatus.OK
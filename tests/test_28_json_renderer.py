@@ -0,0 +1,100 @@
+import datetime
+import io
+import json
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28JsonRenderer:
+    DATA = OrderedDict([
+        ('pub_date', datetime.datetime(
+            2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc
+        )),
+        ('moscow', datetime.datetime(
+            2024, 1, 2, 3, 4, 5,
+            tzinfo=datetime.timezone(datetime.timedelta(hours=3)),
+        )),
+        ('year', datetime.date(2024, 1, 2)),
+        ('rating', Decimal('7.25')),
+        ('float', 5.0),
+        ('id', uuid.UUID('12345678-1234-5678-1234-567812345678')),
+        ('lazy', gettext_lazy('Произведение')),
+        ('counts', {1: 3, 2: 0}),
+        ('results', [
+            {'name': 'Строка\u2028с разделителем\u2029', 'score': None}
+        ]),
+    ])
+
+    def test_01_same_output_as_json_renderer(self):
+        from api.renderers import FastJSONRenderer
+
+        assert FastJSONRenderer().render(self.DATA) == (
+            JSONRenderer().render(self.DATA)
+        ), (
+            'Проверьте, что FastJSONRenderer выдаёт те же байты, что '
+            'JSONRenderer DRF, в том числе для datetime и Decimal.'
+        )
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_02_indent(self):
+        from api.renderers import FastJSONRenderer
+
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(self.DATA, media_type) == (
+            JSONRenderer().render(self.DATA, media_type)
+        )
+
+    def test_03_stdlib_fallback(self, monkeypatch):
+        from api import parsers, renderers
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+        content = renderers.FastJSONRenderer().render(self.DATA)
+        assert content == JSONRenderer().render(self.DATA)
+        assert parsers.FastJSONParser().parse(io.BytesIO(content)) == (
+            json.loads(content)
+        )
+
+    def test_04_api_responses(self, client, user_client, user):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.create(title=title, author=user, text='Да', score=7)
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title.id}/',
+            f'/api/v1/titles/{title.id}/reviews/',
+        ):
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.content == JSONRenderer().render(response.data)
+
+    def test_05_parser(self, user_client):
+        from api.parsers import FastJSONParser
+        from reviews.models import Title
+
+        data = {'text': 'Отзыв', 'score': 8, 'nested': [1, 2.5, None]}
+        stream = io.BytesIO(json.dumps(data).encode())
+        assert FastJSONParser().parse(stream) == data
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(
+            url, data='{"text": "Отзыв", "score": NaN}',
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'JSON parse error' in response.json()['detail']
+        response = user_client.post(
+            url, data=json.dumps({'text': 'Отзыв', 'score': 8}),
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.CREATED
@@ -0,0 +1,199 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+
+class FakeError(Exception):
+    pass
+
+
+class FakePoolError(FakeError):
+    pass
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql):
+        self.connection.executed.append(sql)
+        if self.connection.dead:
+            raise FakeError('server closed the connection unexpectedly')
+
+
+class FakeConnection:
+    IDLE = 0
+    IN_TRANSACTION = 2
+
+    def __init__(self):
+        self.closed = 0
+        self.dead = False
+        self.status = self.IDLE
+        self.executed = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = self.IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class Test29ConnectionPool:
+    """
+    Пул проверяется на поддельном psycopg2: сервер PostgreSQL не нужен.
+    """
+
+    @pytest.fixture
+    def connections(self):
+        return []
+
+    @pytest.fixture
+    def pool_module(self, monkeypatch, connections):
+        def connect(**conn_params):
+            connection = FakeConnection()
+            connections.append(connection)
+            return connection
+
+        psycopg2 = types.ModuleType('psycopg2')
+        psycopg2.Error = FakeError
+        psycopg2.connect = connect
+        psycopg2.extensions = types.SimpleNamespace(
+            TRANSACTION_STATUS_IDLE=FakeConnection.IDLE
+        )
+        psycopg2.pool = types.SimpleNamespace(PoolError=FakePoolError)
+        monkeypatch.setitem(sys.modules, 'psycopg2', psycopg2)
+        monkeypatch.delitem(
+            sys.modules, 'api_yamdb.postgresql_pool.pool', raising=False
+        )
+        module = importlib.import_module('api_yamdb.postgresql_pool.pool')
+        yield module
+        sys.modules.pop('api_yamdb.postgresql_pool.pool', None)
+
+    @pytest.fixture
+    def clock(self, pool_module, monkeypatch):
+        clock = types.SimpleNamespace(now=1000.0)
+        fake_time = types.SimpleNamespace(monotonic=lambda: clock.now)
+        monkeypatch.setattr(pool_module, 'time', fake_time)
+        return clock
+
+    def make_pool(self, pool_module, **options):
+        options = {
+            'min_size': 1, 'max_size': 3, 'timeout': 0.05,
+            'check_after': 30, **options,
+        }
+        return pool_module.ConnectionPool({'database': 'yamdb'}, **options)
+
+    def test_01_keeps_connections_above_min_size(
+        self, pool_module, connections
+    ):
+        connection_pool = self.make_pool(pool_module, min_size=1, max_size=3)
+        assert len(connections) == 1
+        taken = [connection_pool.getconn() for _ in range(3)]
+        assert len(connections) == 3
+        for connection in taken:
+            connection_pool.putconn(connection)
+        assert not any(connection.closed for connection in connections), (
+            'Проверьте, что пул не закрывает возвращённые соединения, '
+            'пока их не больше MAX_SIZE.'
+        )
+        again = [connection_pool.getconn() for _ in range(3)]
+        assert len(connections) == 3, (
+            'Проверьте, что пул выдаёт сохранённые соединения, '
+            'а не подключается к базе заново.'
+        )
+        assert set(map(id, again)) == set(map(id, taken))
+
+    def test_02_waits_for_free_slot(self, pool_module):
+        connection_pool = self.make_pool(
+            pool_module, max_size=2, timeout=0.05
+        )
+        first = connection_pool.getconn()
+        connection_pool.getconn()
+        with pytest.raises(FakePoolError):
+            connection_pool.getconn()
+        connection_pool.putconn(first)
+        assert connection_pool.getconn() is first, (
+            'Проверьте, что освободившийся слот снова можно занять.'
+        )
+
+    def test_03_rollback_on_return(self, pool_module):
+        connection_pool = self.make_pool(pool_module)
+        connection = connection_pool.getconn()
+        connection.status = FakeConnection.IN_TRANSACTION
+        connection_pool.putconn(connection)
+        assert connection.rollbacks == 1, (
+            'Проверьте, что незавершённая транзакция откатывается '
+            'при возврате соединения в пул.'
+        )
+        assert not connection.closed
+        assert connection_pool.getconn() is connection
+
+    def test_04_broken_connection_is_closed_on_return(
+        self, pool_module, connections
+    ):
+        connection_pool = self.make_pool(pool_module, min_size=0)
+        connection = connection_pool.getconn()
+
+        def get_transaction_status():
+            raise FakeError('connection lost')
+
+        connection.get_transaction_status = get_transaction_status
+        connection_pool.putconn(connection)
+        assert connection.closed
+        assert connection_pool.getconn() is not connection
+        assert len(connections) == 2
+
+    def test_05_health_check_after_idle(
+        self, pool_module, clock, connections
+    ):
+        connection_pool = self.make_pool(
+            pool_module, min_size=0, check_after=30
+        )
+        connection = connection_pool.getconn()
+        connection_pool.putconn(connection)
+        clock.now += 10
+        assert connection_pool.getconn() is connection
+        assert connection.executed == [], (
+            'Проверьте, что недавно возвращённое соединение '
+            'выдаётся без проверки.'
+        )
+        connection_pool.putconn(connection)
+        clock.now += 31
+        assert connection_pool.getconn() is connection
+        assert connection.executed == ['SELECT 1'], (
+            'Проверьте, что соединение, пролежавшее в пуле дольше '
+            'CHECK_AFTER, проверяется запросом SELECT 1.'
+        )
+        connection_pool.putconn(connection)
+        connection.dead = True
+        clock.now += 31
+        replacement = connection_pool.getconn()
+        assert replacement is not connection, (
+            'Проверьте, что мёртвое соединение заменяется новым.'
+        )
+        assert connection.closed
+        assert len(connections) == 2
+
+    def test_06_close_closes_all_connections(self, pool_module, connections):
+        connection_pool = self.make_pool(pool_module, min_size=2)
+        taken = connection_pool.getconn()
+        connection_pool.close()
+        assert all(connection.closed for connection in connections)
+        connection_pool.putconn(taken)
+        assert not connection_pool.idle
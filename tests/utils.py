@@ -1,5 +1,9 @@
+from contextlib import contextmanager
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +309,16 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+@contextmanager
+def assert_max_queries(url, max_queries):
+    with CaptureQueriesContext(connection) as context:
+        yield context
+    executed = '\n'.join(query['sql'] for query in context.captured_queries)
+    assert len(context) <= max_queries, (
+        f'Запрос к `{url}` выполнил {len(context)} SQL-запросов при '
+        f'допустимых {max_queries}. Проверьте, что связанные объекты '
+        'загружаются через `select_related`/`prefetch_related`.\n'
+        f'{executed}'
+    )